@@ -7,25 +7,17 @@ A comprehensive file conversion tool with interactive menu interface.
 import os
 import sys
 import argparse
-import subprocess
+import asyncio
+import functools
 import platform
 import shutil
-import glob
-import io
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import List, Optional
 
-try:
-    from tqdm import tqdm
-    HAS_TQDM = True
-except ImportError:
-    HAS_TQDM = False
-    tqdm = lambda x: x
-
-IS_LINUX = platform.system().lower() == "linux"
-IS_WINDOWS = platform.system().lower() == "windows"
-IS_MAC = platform.system().lower() == "darwin"
+from .utils import (IS_WINDOWS, which, ensure_dir, check_import, ext_of, expand_inputs,
+                    get_output_path, _poppler_tool)
 
 
 BANNER = """
@@ -42,37 +34,43 @@ BANNER = """
 ╚══════════════════════════════════════════════════════════════════╝
 """
 
-def clear_screen():
-    """Clear terminal screen."""
-    os.system('cls' if IS_WINDOWS else 'clear')
+_CLEAR = '\x1b[2J\x1b[H'
+# Piped or redirected output gets no escape codes
+_IS_TTY = sys.stdout.isatty()
+_vt_enabled = False
 
-def print_header():
-    """Print banner with animation effect."""
-    clear_screen()
-    print(BANNER)
-    print()
+def _enable_vt_mode() -> None:
+    """Turn on ANSI escape handling in the Windows console (once)."""
+    global _vt_enabled
+    if _vt_enabled:
+        return
+    _vt_enabled = True
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+            kernel32.SetConsoleMode(handle, mode.value | 0x0004)
+    except (AttributeError, OSError):
+        pass
 
-def which(cmd: str) -> Optional[str]:
-    """Find command in system PATH."""
-    return shutil.which(cmd)
+def print_header(body: str = "") -> None:
+    """Redraw the screen: clear, banner, then body, all in one write."""
+    if IS_WINDOWS and _IS_TTY:
+        _enable_vt_mode()
+    sys.stdout.write(f"{_CLEAR if _IS_TTY else ''}{BANNER}\n\n{body}")
+    sys.stdout.flush()
 
-def ensure_dir(path: str) -> None:
-    """Ensure directory exists."""
-    os.makedirs(path, exist_ok=True)
 
-def safe_remove(path: str) -> None:
-    """Safely remove file if it exists."""
-    try:
-        if os.path.exists(path):
-            os.remove(path)
-    except OSError:
-        pass
+# Checked once: scripted runs feed answers through a pipe and must not block
+_STDIN_TTY = sys.stdin.isatty()
 
-def check_import(module_name: str) -> bool:
-    """Check if a module can be imported without crashing."""
-    import importlib.util
-    spec = importlib.util.find_spec(module_name)
-    return spec is not None
+def _pause(msg: str = "\nPress Enter to continue...") -> None:
+    """Wait for Enter before redrawing, unless stdin is not a terminal."""
+    if _STDIN_TTY:
+        input(msg)
 
 def get_input_file(prompt: str) -> str:
     """Get input file path with validation."""
@@ -86,13 +84,35 @@ def get_input_file(prompt: str) -> str:
             continue
         return filepath
 
-def get_output_path(input_path: str, new_ext: str) -> str:
-    """Generate output path based on input."""
-    inp = Path(input_path)
-    # If new_ext doesn't start with dot, add it
-    if not new_ext.startswith('.'):
-        new_ext = '.' + new_ext
-    return str(inp.with_suffix(new_ext))
+
+def get_input_files(prompt: str) -> List[str]:
+    """Get one input file, or every file in a folder or matching a glob (e.g. *.docx)."""
+    while True:
+        pattern = input(f"{prompt}: ").strip().strip('"')
+        if not pattern:
+            print("❌ Please enter a file path or pattern.")
+            continue
+        matches = expand_inputs(pattern)
+        if not matches:
+            print(f"❌ No files found: {pattern}")
+            continue
+        return matches
+
+
+def get_max_dim() -> Optional[int]:
+    """Ask for an optional pixel limit per side; blank keeps full size."""
+    while True:
+        value = input("Downscale to at most N pixels per side (Enter to keep full size): ").strip()
+        if not value:
+            return None
+        try:
+            max_dim = int(value)
+        except ValueError:
+            max_dim = 0
+        if max_dim > 0:
+            return max_dim
+        print("❌ Please enter a positive whole number of pixels.")
+
 
 def confirm_overwrite(path: str) -> bool:
     """Ask for overwrite confirmation if file exists."""
@@ -101,32 +121,77 @@ def confirm_overwrite(path: str) -> bool:
         return resp in ('y', 'yes')
     return True
 
+# Flag each tool prints its version with (not all of them accept --version)
+VERSION_ARGS = {
+    "FFmpeg": ["-version"],
+    "Poppler": ["-v"],
+    "GraphicsMagick": ["version"],
+}
+VERSION_TIMEOUT = 15
+
+async def _tool_version(path: str, args: List[str]) -> Optional[str]:
+    """First line a tool prints for its version flag, or None."""
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            path, *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT)
+    except OSError:
+        return None
+    try:
+        out, _ = await asyncio.wait_for(proc.communicate(), VERSION_TIMEOUT)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return None
+    lines = out.decode("utf-8", errors="replace").strip().splitlines()
+    return lines[0].strip() if lines else None
+
+async def _tool_versions(tools: dict) -> dict:
+    """Query every found tool's version at once; LibreOffice alone takes seconds."""
+    names = [name for name, path in tools.items() if path]
+    versions = await asyncio.gather(
+        *(_tool_version(tools[name], VERSION_ARGS.get(name, ["--version"])) for name in names))
+    return dict(zip(names, versions))
+
 def doctor():
     """Check system dependencies and Python packages."""
-    print_header()
-    print("🔍 SYSTEM DIAGNOSTICS\n")
-    
-    tools = {
-        "LibreOffice": which("libreoffice") or which("soffice"),
-        "Pandoc": which("pandoc"),
-        "Ghostscript": which("gs"),
-        "FFmpeg": which("ffmpeg"),
+    print_header("🔍 SYSTEM DIAGNOSTICS\n\n")
+    
+    tool_probes = {
+        "LibreOffice": lambda: which("libreoffice") or which("soffice"),
+        "Pandoc": lambda: which("pandoc"),
+        "Ghostscript": lambda: which("gs"),
+        "FFmpeg": lambda: which("ffmpeg"),
+        "Poppler": lambda: _poppler_tool("pdftoppm"),
+        "GraphicsMagick": lambda: which("gm"),
     }
     
-    python_packages = {
-        "PIL (Pillow)": check_import("PIL"),
-        "pypdf": check_import("pypdf"),
-        "pdf2image": check_import("pdf2image"),
-        "pdf2docx": check_import("pdf2docx"),
-        "reportlab": check_import("reportlab"),
-        "docx2pdf": check_import("docx2pdf"),
-        "pywin32": check_import("win32com"),
+    package_modules = {
+        "PIL (Pillow)": "PIL",
+        "pypdf": "pypdf",
+        "pikepdf": "pikepdf",
+        "pyvips": "pyvips",
+        "puremagic": "puremagic",
+        "pdf2image": "pdf2image",
+        "pdf2docx": "pdf2docx",
+        "reportlab": "reportlab",
+        "docx2pdf": "docx2pdf",
+        "pywin32": "win32com",
     }
     
+    # PATH and sys.path walks are independent, so probe them all at once
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        tool_futs = {name: ex.submit(probe) for name, probe in tool_probes.items()}
+        pkg_futs = {name: ex.submit(check_import, mod) for name, mod in package_modules.items()}
+    tools = {name: fut.result() for name, fut in tool_futs.items()}
+    python_packages = {name: fut.result() for name, fut in pkg_futs.items()}
+    versions = asyncio.run(_tool_versions(tools))
+    
     print("System Dependencies:")
     print("-" * 40)
     for name, path in tools.items():
         status = f"✅ OK" if path else "❌ MISSING"
+        if versions.get(name):
+            status += f"  {versions[name]}"
         print(f"  {name:15} {status}")
         if path:
             print(f"      └─ {path}")
@@ -146,559 +211,184 @@ def doctor():
     print(f"  Python: {platform.python_version()}")
     print(f"  Machine: {platform.machine()}")
     
-    input("\n\nPress Enter to continue...")
+    _pause("\n\nPress Enter to continue...")
 
-def convert_docx_to_pdf_windows(inp: str, out: str) -> None:
-    """Convert DOCX to PDF using docx2pdf (Windows only)."""
-    try:
-        from docx2pdf import convert
-        convert(inp, out)
-    except ImportError:
-        raise RuntimeError("docx2pdf not installed. Run: pip install docx2pdf")
 
-def convert_docx_to_pdf_linux(inp: str, out: str) -> None:
-    """Convert DOCX to PDF using LibreOffice (Linux/Mac)."""
-    libreoffice = which("libreoffice") or which("soffice")
-    if not libreoffice:
-        raise RuntimeError("LibreOffice not found. Install: sudo apt install libreoffice")
+def run_conversions(inputs: List[str], out_ext: str,
+                    src_fmt: Optional[str] = None) -> None:
+    """Convert one or many input files to out_ext and report the result.
     
-    outdir = os.path.dirname(os.path.abspath(out)) or "."
-    basename = Path(inp).stem
+    src_fmt only applies to a single input; see convert_file.
+    """
+    from .ops import batch_pairs, batch_convert, convert_file
     
-    result = subprocess.run(
-        [libreoffice, "--headless", "--convert-to", "pdf", inp, "--outdir", outdir],
-        capture_output=True,
-        text=True
-    )
-    
-    if result.returncode != 0:
-        raise RuntimeError(f"LibreOffice conversion failed: {result.stderr}")
-    
-    generated = os.path.join(outdir, f"{basename}.pdf")
-    if generated != out and os.path.exists(generated):
-        shutil.move(generated, out)
-
-def convert_docx_to_pdf(inp: str, out: str) -> None:
-    """Route DOCX→PDF conversion based on platform."""
-    if IS_LINUX or IS_MAC:
-        convert_docx_to_pdf_linux(inp, out)
-    elif IS_WINDOWS:
-        convert_docx_to_pdf_windows(inp, out)
-    else:
-        convert_docx_to_pdf_linux(inp, out)
-
-def convert_doc_to_pdf(inp: str, out: str) -> None:
-    """Convert DOC to PDF."""
-    if IS_WINDOWS:
-        try:
-            import win32com.client
-            word = win32com.client.Dispatch("Word.Application")
-            word.Visible = False
-            doc = word.Documents.Open(os.path.abspath(inp))
-            doc.SaveAs(os.path.abspath(out), 17)
-            doc.Close()
-            word.Quit()
-        except ImportError:
-            raise RuntimeError("pywin32 not installed. Run: pip install pywin32")
-        except Exception as e:
-            raise RuntimeError(f"Word automation failed: {e}")
-    else:
-        libreoffice = which("libreoffice") or which("soffice")
-        if libreoffice:
-            convert_docx_to_pdf_linux(inp, out)
-        else:
-            raise RuntimeError("DOC conversion requires LibreOffice on Linux/Mac")
-
-def convert_pdf_to_docx(inp: str, out: str) -> None:
-    """Convert PDF to DOCX."""
-    try:
-        from pdf2docx import Converter
-        cv = Converter(inp)
-        cv.convert(out, start=0, end=None)
-        cv.close()
-    except ImportError:
-        raise RuntimeError("pdf2docx not installed. Run: pip install pdf2docx")
-
-def txt_to_pdf(inp: str, out: str) -> None:
-    """Convert TXT to PDF using ReportLab."""
-    try:
-        from reportlab.pdfgen import canvas
-        from reportlab.lib.pagesizes import A4
-    except ImportError:
-        raise RuntimeError("reportlab not installed. Run: pip install reportlab")
-    
-    c = canvas.Canvas(out, pagesize=A4)
-    width, height = A4
-    x_margin, y_margin = 40, 40
-    y = height - y_margin
-    line_height = 14
-    
-    try:
-        with open(inp, 'r', encoding='utf-8', errors='ignore') as f:
-            for line in f:
-                line = line.rstrip()
-                if len(line) > 100:
-                    words = line.split()
-                    current_line = ""
-                    for word in words:
-                        if len(current_line) + len(word) + 1 < 100:
-                            current_line += " " + word if current_line else word
-                        else:
-                            c.drawString(x_margin, y, current_line)
-                            y -= line_height
-                            if y < y_margin:
-                                c.showPage()
-                                y = height - y_margin
-                            current_line = word
-                    if current_line:
-                        c.drawString(x_margin, y, current_line)
-                        y -= line_height
-                else:
-                    c.drawString(x_margin, y, line)
-                    y -= line_height
-                
-                if y < y_margin:
-                    c.showPage()
-                    y = height - y_margin
-    except Exception as e:
-        c.save()
-        raise RuntimeError(f"Text conversion failed: {e}")
-    
-    c.save()
-
-def md_to_pdf(inp: str, out: str) -> None:
-    """Convert Markdown to PDF using Pandoc."""
-    pandoc = which("pandoc")
-    if not pandoc:
-        raise RuntimeError("Pandoc not found. Install from https://pandoc.org")
-    
-    result = subprocess.run(
-        [pandoc, inp, "-o", out, "--pdf-engine=xelatex"],
-        capture_output=True,
-        text=True
-    )
-    
-    if result.returncode != 0:
-        result = subprocess.run(
-            [pandoc, inp, "-o", out],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode != 0:
-            raise RuntimeError(f"Pandoc failed: {result.stderr}")
-#image#
-
-def image_to_pdf(inp: str, out: str) -> None:
-    """Convert image to PDF."""
-    try:
-        from PIL import Image
-        im = Image.open(inp)
-        if im.mode in ("RGBA", "P"):
-            im = im.convert("RGB")
-        im.save(out, "PDF", resolution=100.0)
-    except ImportError:
-        raise RuntimeError("Pillow not installed. Run: pip install Pillow")
-
-def image_convert(inp: str, out: str) -> None:
-    """Convert between image formats."""
-    try:
-        from PIL import Image
-        im = Image.open(inp)
-        
-        if out.lower().endswith(('.jpg', '.jpeg')):
-            if im.mode in ("RGBA", "P"):
-                background = Image.new("RGB", im.size, (255, 255, 255))
-                if im.mode == "P":
-                    im = im.convert("RGBA")
-                background.paste(im, mask=im.split()[-1] if im.mode == "RGBA" else None)
-                im = background
-        
-        im.save(out)
-    except ImportError:
-        raise RuntimeError("Pillow not installed. Run: pip install Pillow")
-
-def pdf_to_images(inp: str, out_pattern: str) -> None:
-    """Convert PDF to images."""
-    try:
-        from pdf2image import convert_from_path
-        from pdf2image.exceptions import PDFInfoNotInstalledError
-    except ImportError:
-        raise RuntimeError("pdf2image not installed. Run: pip install pdf2image")
-    kwargs = {}
-    if IS_WINDOWS:
-        poppler_paths = [
-            r"C:\Program Files\poppler\bin",
-            r"C:\poppler\bin",
-            r"C:\Users\{}\poppler\bin".format(os.environ.get('USERNAME')),
-        ]
-        for path in poppler_paths:
-            if os.path.exists(path):
-                kwargs['poppler_path'] = path
-                break
+    pairs = batch_pairs(inputs, out_ext)
     
-    try:
-        pages = convert_from_path(inp, dpi=200, **kwargs)
-    except PDFInfoNotInstalledError:
-        if IS_WINDOWS:
-            raise RuntimeError("Poppler not found. Install: choco install poppler")
-        else:
-            raise RuntimeError("poppler not installed. Install: sudo apt install poppler-utils")
-    except Exception as e:
-        raise RuntimeError(f"PDF conversion failed: {e}")
+    if len(pairs) == 1:
+        inp, out = pairs[0]
+        if confirm_overwrite(out):
+            print(f"\n⏳ Converting {Path(inp).name} → {out_ext.upper()}...")
+            if convert_file(inp, out, src_fmt):
+                print(f"✅ Saved: {out}")
+        return
     
-    fmt = Path(out_pattern).suffix[1:].lower() or "png"
-    base = out_pattern.replace(f"{{page}}.{fmt}", "").replace(f".{fmt}", "")
+    existing = [out for _, out in pairs if os.path.exists(out)]
+    if existing:
+        resp = input(f"⚠️  {len(existing)} output file(s) exist. Overwrite? (y/n): ").lower()
+        if resp not in ('y', 'yes'):
+            pairs = [(inp, out) for inp, out in pairs if out not in existing]
+    if not pairs:
+        print("❌ Nothing to convert")
+        return
     
-    for i, page in enumerate(pages, 1):
-        out_path = f"{base}_{i:03d}.{fmt}" if "{page}" in out_pattern else out_pattern.format(page=i)
-        page.save(out_path, fmt.upper() if fmt != "jpg" else "JPEG")
+    print(f"\n⏳ Converting {len(pairs)} files → {out_ext.upper()}...")
+    results = batch_convert(pairs, verified=True)
+    print(f"✅ Converted {sum(results)}/{len(pairs)} files")
 
-#pdf section
-
-def merge_pdfs(inputs: List[str], out: str) -> None:
-    """Merge multiple PDFs into one."""
-    try:
-        from pypdf import PdfMerger
-    except ImportError:
-        try:
-            from PyPDF2 import PdfMerger
-        except ImportError:
-            raise RuntimeError("pypdf not installed. Run: pip install pypdf")
+def keep_convertible(inputs: List[str], out_ext: str) -> List[str]:
+    """Drop the inputs of a folder or pattern that have no route to out_ext."""
+    from .ops import convertible_to
     
     if len(inputs) < 2:
-        raise ValueError("Need at least 2 files to merge")
-    
-    merger = PdfMerger()
-    try:
-        for f in inputs:
-            if not os.path.exists(f):
-                raise FileNotFoundError(f"File not found: {f}")
-            merger.append(f)
-        merger.write(out)
-    finally:
-        merger.close()
-
-def split_pdf(inp: str, outdir: str) -> None:
-    """Split PDF into individual pages."""
-    try:
-        from pypdf import PdfReader, PdfWriter
-    except ImportError:
-        try:
-            from PyPDF2 import PdfReader, PdfWriter
-        except ImportError:
-            raise RuntimeError("pypdf not installed. Run: pip install pypdf")
-    
-    if not os.path.exists(inp):
-        raise FileNotFoundError(f"File not found: {inp}")
-    
-    ensure_dir(outdir)
-    reader = PdfReader(inp)
-    
-    for i, page in enumerate(reader.pages):
-        writer = PdfWriter()
-        writer.add_page(page)
-        out_path = os.path.join(outdir, f"page_{i+1:03d}.pdf")
-        with open(out_path, "wb") as f:
-            writer.write(f)
-    
-    print(f"✅ Split into {len(reader.pages)} pages in {outdir}")
-
-def compress_pdf(inp: str, out: str) -> None:
-    """Compress PDF file size."""
-    try:
-        from pypdf import PdfReader, PdfWriter
-    except ImportError:
-        try:
-            from PyPDF2 import PdfReader, PdfWriter
-        except ImportError:
-            raise RuntimeError("pypdf not installed. Run: pip install pypdf")
-    
-    if not os.path.exists(inp):
-        raise FileNotFoundError(f"File not found: {inp}")
-    
-    reader = PdfReader(inp)
-    writer = PdfWriter()
-    
-    for page in reader.pages:
-        page.compress_content_streams()
-        writer.add_page(page)
-    
-    with open(out, "wb") as f:
-        writer.write(f)
-
-def rotate_pdf(inp: str, out: str, deg: int) -> None:
-    """Rotate PDF pages."""
-    try:
-        from pypdf import PdfReader, PdfWriter
-    except ImportError:
-        try:
-            from PyPDF2 import PdfReader, PdfWriter
-        except ImportError:
-            raise RuntimeError("pypdf not installed. Run: pip install pypdf")
-    
-    if not os.path.exists(inp):
-        raise FileNotFoundError(f"File not found: {inp}")
-    
-    deg = ((deg % 360) // 90) * 90
-    if deg < 0:
-        deg += 360
-    
-    reader = PdfReader(inp)
-    writer = PdfWriter()
-    
-    for page in reader.pages:
-        page.rotate(deg)
-        writer.add_page(page)
-    
-    with open(out, "wb") as f:
-        writer.write(f)
-
-def watermark_pdf(inp: str, out: str, text: str) -> None:
-    """Add text watermark to PDF."""
-    try:
-        from pypdf import PdfReader, PdfWriter
-    except ImportError:
-        try:
-            from PyPDF2 import PdfReader, PdfWriter
-        except ImportError:
-            raise RuntimeError("pypdf not installed. Run: pip install pypdf")
-    
-    try:
-        from reportlab.pdfgen import canvas
-        from reportlab.lib.pagesizes import A4
-    except ImportError:
-        raise RuntimeError("reportlab not installed. Run: pip install reportlab")
-    
-    if not os.path.exists(inp):
-        raise FileNotFoundError(f"File not found: {inp}")
-    
-    packet = io.BytesIO()
-    c = canvas.Canvas(packet, pagesize=A4)
-    c.setFont("Helvetica", 60)
-    c.setFillColorRGB(0.5, 0.5, 0.5, alpha=0.3)
-    c.saveState()
-    c.translate(300, 400)
-    c.rotate(45)
-    c.drawCentredString(0, 0, text)
-    c.restoreState()
-    c.save()
-    packet.seek(0)
-    
-    watermark = PdfReader(packet)
-    reader = PdfReader(inp)
-    writer = PdfWriter()
-    
-    for page in reader.pages:
-        page.merge_page(watermark.pages[0])
-        writer.add_page(page)
-    
-    with open(out, "wb") as f:
-        writer.write(f)
-
-# media 
+        return inputs
+    convertible = convertible_to(inputs, out_ext)
+    if len(convertible) < len(inputs):
+        skipped = len(inputs) - len(convertible)
+        print(f"⚠️  Skipping {skipped} file(s) that can't become {out_ext.upper()}")
+    return convertible
 
-def media_convert(inp: str, out: str) -> None:
-    """Convert media files using FFmpeg."""
-    ffmpeg = which("ffmpeg")
-    if not ffmpeg:
-        raise RuntimeError("FFmpeg not found. Install from https://ffmpeg.org")
-    
-    if not os.path.exists(inp):
-        raise FileNotFoundError(f"File not found: {inp}")
-    
-    result = subprocess.run(
-        [ffmpeg, "-y", "-i", inp, out],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.PIPE,
-        text=True
-    )
-    
-    if result.returncode != 0:
-        raise RuntimeError(f"FFmpeg failed: {result.stderr}")
+#menu
 
-CONVERTERS = {
-    ("pdf", "docx"): convert_pdf_to_docx,
-    ("docx", "pdf"): convert_docx_to_pdf,
-    ("doc", "pdf"): convert_doc_to_pdf,
-    ("txt", "pdf"): txt_to_pdf,
-    ("md", "pdf"): md_to_pdf,
-    ("png", "pdf"): image_to_pdf,
-    ("jpg", "pdf"): image_to_pdf,
-    ("jpeg", "pdf"): image_to_pdf,
-    ("bmp", "pdf"): image_to_pdf,
-    ("webp", "pdf"): image_to_pdf,
-    ("pdf", "png"): lambda i, o: pdf_to_images(i, o.replace(".png", "_{page:03d}.png")),
-    ("pdf", "jpg"): lambda i, o: pdf_to_images(i, o.replace(".jpg", "_{page:03d}.jpg")),
-    ("pdf", "jpeg"): lambda i, o: pdf_to_images(i, o.replace(".jpeg", "_{page:03d}.jpeg")),
-    ("png", "jpg"): image_convert,
-    ("png", "jpeg"): image_convert,
-    ("jpg", "png"): image_convert,
-    ("jpeg", "png"): image_convert,
-    ("bmp", "png"): image_convert,
-    ("webp", "png"): image_convert,
-    ("mp4", "mp3"): media_convert,
-    ("wav", "mp3"): media_convert,
-    ("mp4", "wav"): media_convert,
+# Menu screens are built once and redrawn with a single write
+MAIN_MENU_TEXT = "\n".join([
+    "🎯 MAIN MENU\n",
+    "  [1] 📄 Document Conversions",
+    "  [2] 🖼️  Image Conversions",
+    "  [3] 📑 PDF Operations",
+    "  [4] 🎵 Media Conversions",
+    "  [5] 🔄 Custom Conversion (Any → Any)",
+    "  [6] 🔍 System Check (Doctor)",
+    "  [7] 🔧 Install Dependencies",  # NEW OPTION
+    "  [0] ❌ Exit",
+    "",
+    "",
+])
+
+DOCUMENT_MENU_TEXT = "\n".join([
+    "📄 DOCUMENT CONVERSIONS\n",
+    "  [1] DOCX → PDF",
+    "  [2] PDF → DOCX",
+    "  [3] DOC → PDF",
+    "  [4] TXT → PDF",
+    "  [5] MD → PDF",
+    "  [0] Back to Main Menu",
+    "",
+    "",
+])
+
+IMAGE_MENU_TEXT = "\n".join([
+    "🖼️  IMAGE CONVERSIONS\n",
+    "  Convert FROM any format TO any format\n",
+    "  Supported: PNG, JPG, BMP, WEBP, PDF\n",
+    "  [1] Select input file and convert",
+    "  [0] Back to Main Menu",
+    "",
+    "",
+])
+
+PDF_MENU_TEXT = "\n".join([
+    "📑 PDF OPERATIONS\n",
+    "  [1] Merge PDFs",
+    "  [2] Split PDF",
+    "  [3] Compress PDF",
+    "  [4] Rotate PDF",
+    "  [5] Add Watermark",
+    "  [6] PDF → Images (PNG/JPG)",
+    "  [0] Back to Main Menu",
+    "",
+    "",
+])
+
+MEDIA_MENU_TEXT = "\n".join([
+    "🎵 MEDIA CONVERSIONS\n",
+    "  [1] MP4 → MP3 (Extract audio)",
+    "  [2] WAV → MP3",
+    "  [3] MP4 → WAV",
+    "  [0] Back to Main Menu",
+    "",
+    "",
+])
+
+DOCUMENT_OPTIONS = {
+    "1": ("DOCX", "pdf"),
+    "2": ("PDF", "docx"),
+    "3": ("DOC", "pdf"),
+    "4": ("TXT", "pdf"),
+    "5": ("MD", "pdf"),
 }
 
-def find_chain(src: str, dst: str) -> Optional[List[Tuple[str, str]]]:
-    """Find 2-step conversion chain."""
-    intermediates = ["pdf", "png", "jpg"]
-    for mid in intermediates:
-        src_mid = (src, mid) in CONVERTERS or (src == "jpeg" and mid == "jpg")
-        mid_dst = (mid, dst) in CONVERTERS or (mid == "jpg" and dst == "jpeg")
-        if src_mid and mid_dst:
-            actual_src = "jpg" if src == "jpeg" else src
-            actual_mid = "jpg" if mid == "jpeg" else mid
-            actual_dst = "jpg" if dst == "jpeg" else dst
-            return [(actual_src, actual_mid), (actual_mid, actual_dst)]
-    return None
-
-def dispatch(src: str, dst: str, inp: str, out: str) -> None:
-    """Route conversion to appropriate handler."""
-    src = src.lower().lstrip(".")
-    dst = dst.lower().lstrip(".")
-    
-    if src == "jpeg":
-        src = "jpg"
-    if dst == "jpeg":
-        dst = "jpg"
-    
-    key = (src, dst)
-    
-    if key in CONVERTERS:
-        handler = CONVERTERS[key]
-        handler(inp, out)
-        return
-    
-    raise ValueError(f"No handler for {src} -> {dst}")
-
-def convert_file(inp: str, out: str) -> bool:
-    """Convert single file with error handling."""
-    src = Path(inp).suffix[1:].lower()
-    dst = Path(out).suffix[1:].lower()
-    
-    src_norm = "jpg" if src == "jpeg" else src
-    dst_norm = "jpg" if dst == "jpeg" else dst
-    
-    try:
-        if (src_norm, dst_norm) in CONVERTERS:
-            dispatch(src, dst, inp, out)
-        else:
-            chain = find_chain(src_norm, dst_norm)
-            if chain:
-                temp_files = []
-                try:
-                    current_input = inp
-                    for i, (from_fmt, to_fmt) in enumerate(chain):
-                        if i == len(chain) - 1:
-                            current_output = out
-                        else:
-                            temp = Path(inp).with_suffix(f".tmp_{i}.{to_fmt}")
-                            temp_files.append(str(temp))
-                            current_output = str(temp)
-                        
-                        dispatch(from_fmt, to_fmt, current_input, current_output)
-                        current_input = current_output
-                    
-                    for temp in temp_files:
-                        safe_remove(temp)
-                except Exception:
-                    for temp in temp_files:
-                        safe_remove(temp)
-                    raise
-            else:
-                raise ValueError(f"Unsupported conversion: {src} -> {dst}")
-        
-        return True
-    except Exception as e:
-        print(f"\n❌ Error: {e}")
-        return False
-
-#menu
-
 def menu_document_conversions():
     """Document conversion submenu."""
     while True:
-        print_header()
-        print("📄 DOCUMENT CONVERSIONS\n")
-        print("  [1] DOCX → PDF")
-        print("  [2] PDF → DOCX")
-        print("  [3] DOC → PDF")
-        print("  [4] TXT → PDF")
-        print("  [5] MD → PDF")
-        print("  [0] Back to Main Menu")
-        print()
+        print_header(DOCUMENT_MENU_TEXT)
         
         choice = input("Select option: ").strip()
         
         if choice == "0":
             return
-        elif choice == "1":
-            inp = get_input_file("Enter DOCX file path")
-            out = get_output_path(inp, "pdf")
-            if confirm_overwrite(out):
-                print(f"\n⏳ Converting {Path(inp).name} → PDF...")
-                if convert_file(inp, out):
-                    print(f"✅ Saved: {out}")
-                input("\nPress Enter to continue...")
-        elif choice == "2":
-            inp = get_input_file("Enter PDF file path")
-            out = get_output_path(inp, "docx")
-            if confirm_overwrite(out):
-                print(f"\n⏳ Converting {Path(inp).name} → DOCX...")
-                if convert_file(inp, out):
-                    print(f"✅ Saved: {out}")
-                input("\nPress Enter to continue...")
-        elif choice == "3":
-            inp = get_input_file("Enter DOC file path")
-            out = get_output_path(inp, "pdf")
-            if confirm_overwrite(out):
-                print(f"\n⏳ Converting {Path(inp).name} → PDF...")
-                if convert_file(inp, out):
-                    print(f"✅ Saved: {out}")
-                input("\nPress Enter to continue...")
-        elif choice == "4":
-            inp = get_input_file("Enter TXT file path")
-            out = get_output_path(inp, "pdf")
-            if confirm_overwrite(out):
-                print(f"\n⏳ Converting {Path(inp).name} → PDF...")
-                if convert_file(inp, out):
-                    print(f"✅ Saved: {out}")
-                input("\nPress Enter to continue...")
-        elif choice == "5":
-            inp = get_input_file("Enter MD file path")
-            out = get_output_path(inp, "pdf")
-            if confirm_overwrite(out):
-                print(f"\n⏳ Converting {Path(inp).name} → PDF...")
-                if convert_file(inp, out):
-                    print(f"✅ Saved: {out}")
-                input("\nPress Enter to continue...")
+        elif choice in DOCUMENT_OPTIONS:
+            label, out_ext = DOCUMENT_OPTIONS[choice]
+            inputs = get_input_files(f"Enter {label} file path or pattern (e.g. *.{label.lower()})")
+            if len(inputs) > 1:
+                # A folder can hold other formats; this option only takes its own
+                src = label.lower()
+                matching = [f for f in inputs if ext_of(f) == src]
+                if len(matching) < len(inputs):
+                    print(f"⚠️  Skipping {len(inputs) - len(matching)} file(s) that aren't {label}")
+                inputs = matching
+            if inputs:
+                run_conversions(inputs, out_ext)
+            else:
+                print("❌ Nothing to convert")
+            _pause()
+
+# Formats the image menu accepts as input; only true images can be combined
+IMAGE_SOURCE_FORMATS = ("png", "jpg", "bmp", "webp")
+IMAGE_MENU_FORMATS = IMAGE_SOURCE_FORMATS + ("pdf",)
 
 def menu_image_conversions():
     """Image conversion submenu."""
+    from .ops import file_context, image_to_pdf
+    
     formats = [("PNG", "png"), ("JPG", "jpg"), ("BMP", "bmp"), ("WEBP", "webp"), ("PDF", "pdf")]
     
     while True:
-        print_header()
-        print("🖼️  IMAGE CONVERSIONS\n")
-        print("  Convert FROM any format TO any format\n")
-        print("  Supported: PNG, JPG, BMP, WEBP, PDF\n")
-        print("  [1] Select input file and convert")
-        print("  [0] Back to Main Menu")
-        print()
+        print_header(IMAGE_MENU_TEXT)
         
         choice = input("Select option: ").strip()
         
         if choice == "0":
             return
         elif choice == "1":
-            inp = get_input_file("Enter image file path")
-            src_ext = Path(inp).suffix[1:].upper()
-            print(f"\nDetected format: {src_ext}")
+            inputs = get_input_files("Enter image file path or pattern (e.g. *.png)")
+            fmts = {f: file_context(f).fmt for f in inputs}
+            if len(inputs) > 1:
+                # A folder can hold documents and media too; this menu only takes its own formats
+                matching = [f for f in inputs if fmts[f] in IMAGE_MENU_FORMATS]
+                if len(matching) < len(inputs):
+                    skipped = len(inputs) - len(matching)
+                    print(f"⚠️  Skipping {skipped} file(s) that aren't images or PDFs")
+                inputs = matching
+                if not inputs:
+                    print("❌ Nothing to convert")
+                    _pause()
+                    continue
+                print(f"\n📂 {len(inputs)} files selected")
+            src_exts = sorted({fmts[f].upper() for f in inputs})
+            print(f"\nDetected format: {', '.join(src_exts)}")
             print("Available output formats:")
             for i, (name, ext) in enumerate(formats, 1):
-                marker = "→" if ext.upper() == src_ext else " "
+                marker = "→" if ext.upper() in src_exts else " "
                 print(f"  [{i}] {marker} {name}")
             
             fmt_choice = input("\nSelect output format (number): ").strip()
@@ -706,19 +396,39 @@ def menu_image_conversions():
                 idx = int(fmt_choice) - 1
                 if 0 <= idx < len(formats):
                     out_ext = formats[idx][1]
-                    out = get_output_path(inp, out_ext)
-                    if confirm_overwrite(out):
-                        print(f"\n⏳ Converting {Path(inp).name} → {out_ext.upper()}...")
-                        if convert_file(inp, out):
-                            print(f"✅ Saved: {out}")
-                        input("\nPress Enter to continue...")
+                    images = [f for f in inputs if fmts[f] in IMAGE_SOURCE_FORMATS]
+                    if out_ext == "pdf" and len(images) > 1:
+                        resp = input("Combine into a single PDF? (y/n): ").lower()
+                        if resp in ('y', 'yes'):
+                            if len(images) < len(inputs):
+                                print(f"⚠️  Leaving out {len(inputs) - len(images)} PDF file(s)")
+                            out = (input("Output file name (e.g., images.pdf): ").strip()
+                                   or "images.pdf")
+                            if not out.endswith('.pdf'):
+                                out += '.pdf'
+                            max_dim = get_max_dim()
+                            if confirm_overwrite(out):
+                                print(f"\n⏳ Combining {len(images)} images...")
+                                try:
+                                    image_to_pdf(images, out, max_dim)
+                                    print(f"✅ Saved: {out}")
+                                except Exception as e:
+                                    print(f"❌ Error: {e}")
+                            _pause()
+                            continue
+                    inputs = keep_convertible(inputs, out_ext)
+                    if inputs:
+                        run_conversions(inputs, out_ext)
+                    else:
+                        print("❌ Nothing to convert")
+                    _pause()
             except ValueError:
                 print("❌ Invalid selection")
-                input("\nPress Enter to continue...")
+                _pause()
+
 def install_dependencies():
     """Auto-install all required dependencies."""
-    print_header()
-    print("🔧 DEPENDENCY INSTALLER\n")
+    print_header("🔧 DEPENDENCY INSTALLER\n\n")
     
     import subprocess
     import sys
@@ -727,6 +437,7 @@ def install_dependencies():
     packages = [
         "Pillow",
         "pypdf",
+        "pikepdf",
         "pdf2image",
         "pdf2docx",
         "reportlab",
@@ -748,6 +459,16 @@ def install_dependencies():
         except subprocess.CalledProcessError as e:
             print(f"❌ Failed to install {pkg}: {e}")
     
+    # Newly installed packages must show up in later lookups
+    import importlib
+    importlib.invalidate_caches()
+    check_import.cache_clear()
+    which.cache_clear()
+    # The image backend is picked once per process; only re-pick it if ops is loaded
+    ops = sys.modules.get("convctl.ops")
+    if ops is not None:
+        ops._image_backend.cache_clear()
+    
     print("\n" + "=" * 40)
     print("🖥️  SYSTEM DEPENDENCIES")
     print("=" * 40)
@@ -790,162 +511,197 @@ sudo pacman -S ffmpeg libreoffice pandoc poppler
 brew install ffmpeg libreoffice pandoc poppler
 """)
     
-    input("\nPress Enter to continue...")
+    _pause()
+
+def _pdf_merge():
+    """Menu action: merge several PDFs."""
+    from .ops import merge_pdfs
+    
+    files = []
+    print("Enter PDF files to merge (empty line to finish):")
+    while True:
+        f = input(f"  File {len(files)+1}: ").strip().strip('"')
+        if not f:
+            break
+        if os.path.exists(f):
+            files.append(f)
+        else:
+            print(f"  ❌ File not found: {f}")
+    
+    if len(files) < 2:
+        print("❌ Need at least 2 files to merge")
+        _pause()
+        return
+    
+    out = input("Output file name (e.g., merged.pdf): ").strip()
+    if not out.endswith('.pdf'):
+        out += '.pdf'
+    if confirm_overwrite(out):
+        print(f"\n⏳ Merging {len(files)} PDFs...")
+        try:
+            merge_pdfs(files, out)
+            print(f"✅ Saved: {out}")
+        except Exception as e:
+            print(f"❌ Error: {e}")
+        _pause()
+
+def _pdf_split():
+    """Menu action: split a PDF into one file per page."""
+    from .ops import split_pdf
+    
+    inp = get_input_file("Enter PDF file path")
+    outdir = input("Output directory (default: pages): ").strip() or "pages"
+    print(f"\n⏳ Splitting PDF...")
+    try:
+        split_pdf(inp, outdir)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    _pause()
+
+def _pdf_compress():
+    """Menu action: compress a PDF."""
+    from .ops import compress_pdf
+    
+    inp = get_input_file("Enter PDF file path")
+    out = get_output_path(inp, "_compressed.pdf")
+    if confirm_overwrite(out):
+        print(f"\n⏳ Compressing PDF...")
+        try:
+            compress_pdf(inp, out)
+            print(f"✅ Saved: {out}")
+        except Exception as e:
+            print(f"❌ Error: {e}")
+        _pause()
+
+def _pdf_rotate():
+    """Menu action: rotate every page of a PDF."""
+    from .ops import rotate_pdf
+    
+    inp = get_input_file("Enter PDF file path")
+    deg = input("Rotation degrees (90, 180, 270, -90): ").strip()
+    try:
+        deg = int(deg)
+        out = get_output_path(inp, f"_rotated{deg}.pdf")
+        if confirm_overwrite(out):
+            print(f"\n⏳ Rotating PDF {deg}°...")
+            try:
+                rotate_pdf(inp, out, deg)
+                print(f"✅ Saved: {out}")
+            except Exception as e:
+                print(f"❌ Error: {e}")
+        _pause()
+    except ValueError:
+        print("❌ Invalid rotation value")
+        _pause()
+
+def _pdf_watermark():
+    """Menu action: stamp a text watermark on every page."""
+    from .ops import watermark_pdf
+    
+    inp = get_input_file("Enter PDF file path")
+    text = input("Watermark text: ").strip()
+    if text:
+        out = get_output_path(inp, "_watermarked.pdf")
+        if confirm_overwrite(out):
+            print(f"\n⏳ Adding watermark...")
+            try:
+                watermark_pdf(inp, out, text)
+                print(f"✅ Saved: {out}")
+            except Exception as e:
+                print(f"❌ Error: {e}")
+        _pause()
+
+def _pdf_images():
+    """Menu action: render each page of a PDF to an image."""
+    from .ops import pdf_to_images
+    
+    inp = get_input_file("Enter PDF file path")
+    fmt = input("Output format (png/jpg): ").strip().lower() or "png"
+    if fmt not in ('png', 'jpg'):
+        fmt = 'png'
+    out = get_output_path(inp, f".{fmt}")
+    print(f"\n⏳ Converting PDF to {fmt.upper()} images...")
+    try:
+        pdf_to_images(inp, out.replace(f".{fmt}", "_{page:03d}.{fmt}"))
+        print(f"✅ Images saved")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    _pause()
+
+PDF_ACTIONS = {
+    "1": _pdf_merge,
+    "2": _pdf_split,
+    "3": _pdf_compress,
+    "4": _pdf_rotate,
+    "5": _pdf_watermark,
+    "6": _pdf_images,
+}
 
 def menu_pdf_operations():
     """PDF operations submenu."""
     while True:
-        print_header()
-        print("📑 PDF OPERATIONS\n")
-        print("  [1] Merge PDFs")
-        print("  [2] Split PDF")
-        print("  [3] Compress PDF")
-        print("  [4] Rotate PDF")
-        print("  [5] Add Watermark")
-        print("  [6] PDF → Images (PNG/JPG)")
-        print("  [0] Back to Main Menu")
-        print()
+        print_header(PDF_MENU_TEXT)
         
         choice = input("Select option: ").strip()
         
         if choice == "0":
             return
-        elif choice == "1":
-            files = []
-            print("Enter PDF files to merge (empty line to finish):")
-            while True:
-                f = input(f"  File {len(files)+1}: ").strip().strip('"')
-                if not f:
-                    break
-                if os.path.exists(f):
-                    files.append(f)
-                else:
-                    print(f"  ❌ File not found: {f}")
-            
-            if len(files) < 2:
-                print("❌ Need at least 2 files to merge")
-                input("\nPress Enter to continue...")
-                continue
-            
-            out = input("Output file name (e.g., merged.pdf): ").strip()
-            if not out.endswith('.pdf'):
-                out += '.pdf'
-            if confirm_overwrite(out):
-                print(f"\n⏳ Merging {len(files)} PDFs...")
-                try:
-                    merge_pdfs(files, out)
-                    print(f"✅ Saved: {out}")
-                except Exception as e:
-                    print(f"❌ Error: {e}")
-                input("\nPress Enter to continue...")
-        
-        elif choice == "2":
-            inp = get_input_file("Enter PDF file path")
-            outdir = input("Output directory (default: pages): ").strip() or "pages"
-            print(f"\n⏳ Splitting PDF...")
-            try:
-                split_pdf(inp, outdir)
-            except Exception as e:
-                print(f"❌ Error: {e}")
-            input("\nPress Enter to continue...")
-        
-        elif choice == "3":
-            inp = get_input_file("Enter PDF file path")
-            out = get_output_path(inp, "_compressed.pdf")
-            if confirm_overwrite(out):
-                print(f"\n⏳ Compressing PDF...")
-                try:
-                    compress_pdf(inp, out)
-                    print(f"✅ Saved: {out}")
-                except Exception as e:
-                    print(f"❌ Error: {e}")
-                input("\nPress Enter to continue...")
-        
-        elif choice == "4":
-            inp = get_input_file("Enter PDF file path")
-            deg = input("Rotation degrees (90, 180, 270, -90): ").strip()
-            try:
-                deg = int(deg)
-                out = get_output_path(inp, f"_rotated{deg}.pdf")
-                if confirm_overwrite(out):
-                    print(f"\n⏳ Rotating PDF {deg}°...")
-                    try:
-                        rotate_pdf(inp, out, deg)
-                        print(f"✅ Saved: {out}")
-                    except Exception as e:
-                        print(f"❌ Error: {e}")
-                input("\nPress Enter to continue...")
-            except ValueError:
-                print("❌ Invalid rotation value")
-                input("\nPress Enter to continue...")
-        
-        elif choice == "5":
-            inp = get_input_file("Enter PDF file path")
-            text = input("Watermark text: ").strip()
-            if text:
-                out = get_output_path(inp, "_watermarked.pdf")
-                if confirm_overwrite(out):
-                    print(f"\n⏳ Adding watermark...")
-                    try:
-                        watermark_pdf(inp, out, text)
-                        print(f"✅ Saved: {out}")
-                    except Exception as e:
-                        print(f"❌ Error: {e}")
-                input("\nPress Enter to continue...")
-        
-        elif choice == "6":
-            inp = get_input_file("Enter PDF file path")
-            fmt = input("Output format (png/jpg): ").strip().lower() or "png"
-            if fmt not in ('png', 'jpg'):
-                fmt = 'png'
-            out = get_output_path(inp, f".{fmt}")
-            print(f"\n⏳ Converting PDF to {fmt.upper()} images...")
-            try:
-                pdf_to_images(inp, out.replace(f".{fmt}", "_{page:03d}.{fmt}"))
-                print(f"✅ Images saved")
-            except Exception as e:
-                print(f"❌ Error: {e}")
-            input("\nPress Enter to continue...")
+        action = PDF_ACTIONS.get(choice)
+        if action:
+            action()
+
+MEDIA_OPTIONS = {
+    "1": ("MP4", "mp3"),
+    "2": ("WAV", "mp3"),
+    "3": ("MP4", "wav"),
+}
 
 def menu_media_conversions():
     """Media conversion submenu."""
     while True:
-        print_header()
-        print("🎵 MEDIA CONVERSIONS\n")
-        print("  [1] MP4 → MP3 (Extract audio)")
-        print("  [2] WAV → MP3")
-        print("  [3] MP4 → WAV")
-        print("  [0] Back to Main Menu")
-        print()
+        print_header(MEDIA_MENU_TEXT)
         
         choice = input("Select option: ").strip()
         
         if choice == "0":
             return
-        elif choice in ("1", "2", "3"):
-            inp = get_input_file("Enter media file path")
-            if choice == "1":
-                out = get_output_path(inp, "mp3")
-            elif choice == "2":
-                out = get_output_path(inp, "mp3")
+        elif choice in MEDIA_OPTIONS:
+            label, out_ext = MEDIA_OPTIONS[choice]
+            inputs = get_input_files(f"Enter {label} file, folder or pattern")
+            if len(inputs) > 1:
+                # Other media in a folder may reach out_ext too; this option only takes its own
+                src = label.lower()
+                matching = [f for f in inputs if ext_of(f) == src]
+                if len(matching) < len(inputs):
+                    print(f"⚠️  Skipping {len(inputs) - len(matching)} file(s) that aren't {label}")
+                inputs = keep_convertible(matching, out_ext)
+            if inputs:
+                run_conversions(inputs, out_ext)
             else:
-                out = get_output_path(inp, "wav")
-            
-            if confirm_overwrite(out):
-                print(f"\n⏳ Converting {Path(inp).name}...")
-                if convert_file(inp, out):
-                    print(f"✅ Saved: {out}")
-                input("\nPress Enter to continue...")
+                print("❌ Nothing to convert")
+            _pause()
 
 def menu_custom_conversion():
     """Custom conversion - any to any."""
-    print_header()
-    print("🔄 CUSTOM CONVERSION\n")
-    print("Convert any supported format to any other format\n")
-    
-    inp = get_input_file("Enter input file path")
-    src_ext = Path(inp).suffix[1:].upper()
-    print(f"\nDetected input format: {src_ext}")
+    from .ops import file_context, _norm_fmt, _sniff_ext
+    
+    print_header("🔄 CUSTOM CONVERSION\n\n"
+                 "Convert any supported format to any other format\n\n")
+    
+    inputs = get_input_files("Enter input file, folder or pattern")
+    src_fmt = None
+    if len(inputs) == 1:
+        ctx = file_context(inputs[0])
+        sniffed = _sniff_ext(ctx.path)
+        if sniffed and sniffed != ctx.fmt:
+            # A renamed file would otherwise go down the wrong pipeline and fail late
+            resp = input(f"\n⚠️  {Path(ctx.path).name} looks like {sniffed.upper()}, "
+                         f"not {ctx.fmt.upper()}. Treat it as {sniffed.upper()}? (y/n): ").lower()
+            if resp in ('y', 'yes'):
+                src_fmt = sniffed
+        print(f"\nDetected input format: {(src_fmt or ctx.fmt).upper()}")
+    else:
+        print(f"\n📂 {len(inputs)} files selected")
     
     print("\nSupported output formats:")
     all_formats = ["PDF", "DOCX", "PNG", "JPG", "BMP", "WEBP", "MP3", "WAV"]
@@ -963,58 +719,57 @@ def menu_custom_conversion():
         out_ext = choice.lower().lstrip('.')
     
     if out_ext:
-        out = get_output_path(inp, out_ext)
-        if confirm_overwrite(out):
-            print(f"\n⏳ Converting {Path(inp).name} → {out_ext.upper()}...")
-            if convert_file(inp, out):
-                print(f"✅ Saved: {out}")
-        input("\nPress Enter to continue...")
+        if len(inputs) == 1 and _norm_fmt(out_ext) == (src_fmt or ctx.fmt):
+            # Nothing to decode or re-encode; at most the file needs its proper extension
+            out = get_output_path(inputs[0], out_ext)
+            if os.path.abspath(out) == os.path.abspath(inputs[0]):
+                print(f"✅ Already {out_ext.upper()}, nothing to convert.")
+            elif confirm_overwrite(out):
+                shutil.copyfile(inputs[0], out)
+                print(f"✅ Same format, copied: {out}")
+            _pause()
+            return
+        inputs = keep_convertible(inputs, out_ext)
+        if inputs:
+            run_conversions(inputs, out_ext, src_fmt=src_fmt)
+        else:
+            print("❌ Nothing to convert")
+        _pause()
     else:
         print("❌ Invalid format selected")
-        input("\nPress Enter to continue...")
+        _pause()
+
+MAIN_ACTIONS = {
+    "1": menu_document_conversions,
+    "2": menu_image_conversions,
+    "3": menu_pdf_operations,
+    "4": menu_media_conversions,
+    "5": menu_custom_conversion,
+    "6": doctor,
+    "7": install_dependencies,
+}
 
 def main_menu():
     """Main interactive menu."""
     while True:
-        print_header()
-        print("🎯 MAIN MENU\n")
-        print("  [1] 📄 Document Conversions")
-        print("  [2] 🖼️  Image Conversions")
-        print("  [3] 📑 PDF Operations")
-        print("  [4] 🎵 Media Conversions")
-        print("  [5] 🔄 Custom Conversion (Any → Any)")
-        print("  [6] 🔍 System Check (Doctor)")
-        print("  [7] 🔧 Install Dependencies")  # NEW OPTION
-        print("  [0] ❌ Exit")
-        print()
+        print_header(MAIN_MENU_TEXT)
         
         choice = input("Select option: ").strip()
         
         if choice == "0":
-            print_header()
-            print("👋 Goodbye! Thanks for using Convctl.\n")
+            print_header("👋 Goodbye! Thanks for using Convctl.\n\n")
             sys.exit(0)
-        elif choice == "1":
-            menu_document_conversions()
-        elif choice == "2":
-            menu_image_conversions()
-        elif choice == "3":
-            menu_pdf_operations()
-        elif choice == "4":
-            menu_media_conversions()
-        elif choice == "5":
-            menu_custom_conversion()
-        elif choice == "6":
-            doctor()
-        elif choice == "7":  # NEW
-            install_dependencies()
+        action = MAIN_ACTIONS.get(choice)
+        if action:
+            action()
         else:
             print("❌ Invalid option")
             time.sleep(1)
 #cli
 
-def cli_mode():
-    """Original CLI mode for scripting."""
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Argument parser for cli_mode, built once."""
     parser = argparse.ArgumentParser(
         description="Universal File Converter",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -1023,29 +778,80 @@ Examples:
   %(prog)s input.docx output.pdf
   %(prog)s --merge a.pdf b.pdf out.pdf
   %(prog)s input.pdf pages/ --split
+  %(prog)s --batch "docs/*.docx" pdf --outdir out/
+  %(prog)s --manifest jobs.csv
+
+Manifest rows are op,input,output[,arg] with op one of convert, merge
+(inputs separated by ;), split, compress, rotate (arg: degrees) or
+watermark (arg: text). Independent rows run concurrently; a row that
+reads or writes a file an earlier row uses waits for it.
         """
     )
     
     parser.add_argument("input", nargs="?", help="Input file")
     parser.add_argument("output", nargs="?", help="Output file")
+    parser.add_argument("more", nargs="*", help=argparse.SUPPRESS)
     parser.add_argument("--merge", action="store_true")
     parser.add_argument("--split", action="store_true")
     parser.add_argument("--compress", action="store_true")
     parser.add_argument("--rotate", type=int)
     parser.add_argument("--watermark")
-    parser.add_argument("--batch", action="store_true")
+    parser.add_argument("--batch", action="store_true",
+                        help="Convert every file in INPUT (folder or glob) to format OUTPUT")
+    parser.add_argument("--outdir", help="Output directory for --batch")
+    parser.add_argument("--manifest", metavar="FILE",
+                        help="Run the op,input,output[,arg] rows in FILE in one process")
     parser.add_argument("--doctor", action="store_true")
     parser.add_argument("--cli", action="store_true", help="Force CLI mode")
+    return parser
+
+def cli_mode(argv: Optional[List[str]] = None):
+    """Original CLI mode for scripting."""
+    parser = _build_parser()
+    args = parser.parse_args(argv)
     
-    args = parser.parse_args()
+    if args.more and not args.merge:
+        parser.error(f"unrecognized arguments: {' '.join(args.more)}")
     
     if args.doctor:
         doctor()
         return
     
+    from .ops import (batch_pairs, batch_convert, convertible_to, convert_file, run_manifest,
+                      merge_pdfs, split_pdf, compress_pdf, rotate_pdf, watermark_pdf)
+    
+    if args.batch:
+        if not args.input or not args.output:
+            parser.error("--batch needs INPUT (folder or glob pattern) and OUTPUT format")
+        out_ext = args.output.lower().lstrip(".")
+        inputs = convertible_to(expand_inputs(args.input), out_ext)
+        if not inputs:
+            print(f"No files in {args.input} can be converted to {out_ext}")
+            sys.exit(1)
+        if args.outdir:
+            ensure_dir(args.outdir)
+        pairs = batch_pairs(inputs, out_ext, args.outdir)
+        results = batch_convert(pairs, verified=True)
+        print(f"Converted {sum(results)}/{len(pairs)} files")
+        if not all(results):
+            sys.exit(1)
+        return
+    
+    if args.manifest:
+        try:
+            results = run_manifest(args.manifest)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"Completed {sum(results)}/{len(results)} jobs")
+        if not all(results):
+            sys.exit(1)
+        return
+    
     if args.merge:
-        inputs = sys.argv[2:-1]
-        output = sys.argv[-1]
+        *inputs, output = [a for a in (args.input, args.output, *args.more) if a]
+        if not inputs:
+            parser.error("--merge needs at least one input and an output file")
         merge_pdfs(inputs, output)
         print(f"Merged {len(inputs)} files into {output}")
         return
@@ -1075,6 +881,16 @@ Examples:
     else:
         sys.exit(1)
 
+def __getattr__(name: str):
+    """Keep converter functions importable from convctl.cli (loaded on first use)."""
+    if name.startswith("__"):
+        raise AttributeError(name)
+    from . import ops
+    try:
+        return getattr(ops, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
 def main():
     """Entry point - auto-detect interactive or CLI mode."""
     if len(sys.argv) > 1 and sys.argv[1] not in ('--cli',):
@@ -1085,6 +901,10 @@ def main():
         except KeyboardInterrupt:
             print("\n\n👋 Interrupted. Goodbye!")
             sys.exit(0)
+        except EOFError:
+            # Scripted input ran out before an exit choice
+            print("\n\n👋 End of input. Goodbye!")
+            sys.exit(0)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,1474 @@
+"""
+Conversion engine: converter backends, format handlers, PDF operations
+and batch processing.
+
+Importing this module loads the heavy optional backends (Pillow, pypdf,
+pdf2docx, ...), so the CLI imports it lazily, only once a conversion is
+actually requested.
+"""
+
+import os
+import atexit
+import csv
+import functools
+import subprocess
+import re
+import shutil
+import struct
+import io
+import json
+import queue
+import tempfile
+import textwrap
+import time
+import threading
+import zipfile
+import zlib
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Tuple, Optional, Union
+
+from .utils import (IS_LINUX, IS_WINDOWS, IS_MAC, which, ensure_dir, safe_remove,
+                    run_tool, check_import, ext_of, stem_of, get_output_path,
+                    _poppler_dir, _poppler_tool)
+
+try:
+    from tqdm import tqdm
+    HAS_TQDM = True
+except ImportError:
+    HAS_TQDM = False
+    tqdm = lambda x, **kwargs: x
+
+# Converter backends are resolved once here; handlers check for None
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:
+    try:
+        from PyPDF2 import PdfReader, PdfWriter
+    except ImportError:
+        PdfReader = PdfWriter = None
+
+try:
+    import pikepdf
+except ImportError:
+    pikepdf = None
+
+try:
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.pagesizes import A4
+except ImportError:
+    canvas = A4 = None
+
+try:
+    import pyvips
+except (ImportError, OSError):
+    # OSError: the binding is installed but libvips itself is not
+    pyvips = None
+
+try:
+    from pdf2image import convert_from_path, convert_from_bytes
+    from pdf2image.exceptions import PDFInfoNotInstalledError
+except ImportError:
+    convert_from_path = convert_from_bytes = PDFInfoNotInstalledError = None
+
+try:
+    from pdf2docx import Converter
+except ImportError:
+    Converter = None
+
+# Content sniffing: puremagic is pure Python; libmagic is the fallback
+try:
+    import puremagic
+except ImportError:
+    puremagic = None
+
+try:
+    import magic
+except (ImportError, OSError):
+    magic = None
+
+
+def _require(backend, package: str) -> None:
+    """Raise with an install hint if an optional backend failed to import."""
+    if backend is None:
+        raise RuntimeError(f"{package} not installed. Run: pip install {package}")
+
+def _name_of(target) -> str:
+    """File name of a path or of a named in-memory buffer."""
+    return target if isinstance(target, str) else getattr(target, "name", "")
+
+_exists_cache: Optional[dict] = None
+
+@contextmanager
+def stat_cache_scope(known: Iterable[str] = ()):
+    """Memoize input existence checks for the duration of a batch.
+    
+    Paths in known (e.g. just listed by glob) are taken as existing. A plain
+    module-level dict is used rather than thread-local state so the batch's
+    worker threads share it.
+    """
+    global _exists_cache
+    previous = _exists_cache
+    _exists_cache = dict.fromkeys(known, True)
+    try:
+        yield
+    finally:
+        _exists_cache = previous
+
+def _cached_exists(path: str) -> bool:
+    """os.path.exists, answered from the batch cache when one is active."""
+    cache = _exists_cache
+    if cache is None:
+        return os.path.exists(path)
+    try:
+        return cache[path]
+    except KeyError:
+        result = cache[path] = os.path.exists(path)
+        return result
+
+@dataclass(frozen=True)
+class FileContext:
+    """An input file together with the format the converters will treat it as."""
+    path: str
+    fmt: str
+
+# MIME types of the formats the converters accept
+MIME_FORMATS = {
+    "application/pdf": "pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+    "application/msword": "doc",
+    "text/plain": "txt",
+    "text/markdown": "md",
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/bmp": "bmp",
+    "image/x-ms-bmp": "bmp",
+    "image/webp": "webp",
+    "video/mp4": "mp4",
+    "audio/mpeg": "mp3",
+    "audio/wav": "wav",
+    "audio/x-wav": "wav",
+}
+
+# (format, ((offset, magic bytes), ...)) for the formats with a fixed header;
+# every check in a row has to match
+FILE_SIGNATURES = (
+    ("pdf", ((0, b"%PDF"),)),
+    ("png", ((0, b"\x89PNG\r\n\x1a\n"),)),
+    ("jpg", ((0, b"\xff\xd8\xff"),)),
+    # "BM" alone matches plenty of text; the header's reserved bytes are zero
+    ("bmp", ((0, b"BM"), (6, b"\0\0\0\0"))),
+    ("webp", ((0, b"RIFF"), (8, b"WEBP"))),
+    ("wav", ((0, b"RIFF"), (8, b"WAVE"))),
+    ("mp3", ((0, b"ID3"),)),
+    ("mp3", ((0, b"\xff\xfb"),)),
+    ("mp3", ((0, b"\xff\xf3"),)),
+    ("mp3", ((0, b"\xff\xf2"),)),
+    ("mp4", ((4, b"ftyp"),)),
+    # Every ZIP starts like this; _sniff_ext confirms DOCX by its contents
+    ("docx", ((0, b"PK\x03\x04"),)),
+    # Generic OLE header (also .xls, .ppt, .msg); _sniff_ext confirms DOC
+    ("doc", ((0, b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"),)),
+)
+
+def _is_docx(path: str) -> bool:
+    """Whether a ZIP file is a Word document rather than any other archive."""
+    try:
+        with zipfile.ZipFile(path) as zf:
+            zf.getinfo("word/document.xml")
+        return True
+    except (zipfile.BadZipFile, KeyError, OSError):
+        return False
+
+# Directory entry name of the main stream in a Word 97-2003 compound file
+_WORD_STREAM = "WordDocument\0".encode("utf-16-le")
+_CFB_END = 0xFFFFFFFA  # sector numbers from here up mark chain ends and free sectors
+
+def _is_doc(path: str) -> bool:
+    """Whether an OLE compound file holds a WordDocument stream.
+    
+    Walks the directory chain through the FAT sectors listed in the header,
+    which covers the directory of any file up to several megabytes.
+    """
+    try:
+        with open(path, "rb") as f:
+            header = f.read(512)
+            shift = struct.unpack_from("<H", header, 30)[0]
+            if shift not in (9, 12):
+                return False
+            size = 1 << shift
+            per_fat = size // 4
+            sector = struct.unpack_from("<I", header, 48)[0]
+            difat = struct.unpack_from("<109I", header, 76)
+            
+            def read_sector(n: int) -> bytes:
+                f.seek((n + 1) * size)
+                return f.read(size)
+            
+            seen = set()
+            while sector < _CFB_END and sector not in seen:
+                seen.add(sector)
+                entries = read_sector(sector)
+                for off in range(0, len(entries) - 127, 128):
+                    name_len = struct.unpack_from("<H", entries, off + 64)[0]
+                    # Object type 2 is a stream
+                    if entries[off:off + name_len] == _WORD_STREAM and entries[off + 66] == 2:
+                        return True
+                if sector // per_fat >= len(difat):
+                    return False
+                fat = read_sector(difat[sector // per_fat])
+                sector = struct.unpack_from("<I", fat, (sector % per_fat) * 4)[0]
+    except (OSError, struct.error, IndexError):
+        return False
+    return False
+
+def _sniff_ext(path: str) -> Optional[str]:
+    """Format named by the file's first 16 bytes, or None if none matches."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(16)
+    except OSError:
+        return None
+    for fmt, checks in FILE_SIGNATURES:
+        if all(head[offset:offset + len(sig)] == sig for offset, sig in checks):
+            if (fmt == "docx" and not _is_docx(path)) or (fmt == "doc" and not _is_doc(path)):
+                continue
+            return fmt
+    return None
+
+def _detect_mime(path: str) -> Optional[str]:
+    """MIME type of path from its header bytes, or None if unknown."""
+    if puremagic is not None:
+        try:
+            return puremagic.from_file(path, mime=True) or None
+        except Exception:
+            pass
+    if magic is not None:
+        try:
+            return magic.from_file(path, mime=True)
+        except Exception:
+            pass
+    return None
+
+@functools.lru_cache(maxsize=256)
+def _detect_type(path: str, mtime_ns: int) -> str:
+    """Format of path; mtime_ns is part of the key so edits invalidate it.
+    
+    The extension wins whenever there is one, so an archive or spreadsheet
+    is never mistaken for a convertible format; only files without an
+    extension have their header sniffed.
+    """
+    ext = _norm_fmt(ext_of(path))
+    if ext:
+        return ext
+    return _sniff_ext(path) or MIME_FORMATS.get(_detect_mime(path), ext)
+
+def file_context(path: str) -> FileContext:
+    """Describe path, reusing the detected format while the file is unchanged."""
+    return FileContext(path, _detect_type(path, os.stat(path).st_mtime_ns))
+
+
+def convert_docx_to_pdf_windows(inp: str, out: str) -> None:
+    """Convert DOCX to PDF using docx2pdf (Windows only)."""
+    try:
+        from docx2pdf import convert
+        convert(inp, out)
+    except ImportError:
+        raise RuntimeError("docx2pdf not installed. Run: pip install docx2pdf")
+
+# A per-process named pipe rather than a TCP port: concurrent convctl runs
+# get their own listener, and other local users cannot connect to it
+SOFFICE_PIPE = f"convctl_{os.getpid()}"
+_soffice_proc = None
+_uno_desktop = None
+# LibreOffice refuses to run two instances on one user profile, so batch
+# workers take turns on it while other conversions keep running.
+_soffice_lock = threading.Lock()
+
+def find_libreoffice() -> str:
+    """Return the LibreOffice binary or raise with install hint."""
+    libreoffice = which("libreoffice") or which("soffice")
+    if not libreoffice:
+        raise RuntimeError("LibreOffice not found. Install: sudo apt install libreoffice")
+    return libreoffice
+
+def _soffice_profile_dir() -> Path:
+    return Path(tempfile.gettempdir(), f"lo_profile_{os.getpid()}")
+
+def _stop_soffice_listener() -> None:
+    """Stop the listener and remove its throwaway user profile."""
+    if _soffice_proc is not None and _soffice_proc.poll() is None:
+        _soffice_proc.terminate()
+        try:
+            _soffice_proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            _soffice_proc.kill()
+            _soffice_proc.wait()
+    shutil.rmtree(_soffice_profile_dir(), ignore_errors=True)
+
+def _ensure_soffice_listener(libreoffice: str) -> None:
+    """Start one headless LibreOffice listener for the whole session."""
+    global _soffice_proc
+    if _soffice_proc is not None and _soffice_proc.poll() is None:
+        return
+    if _soffice_proc is None:
+        # A restarted listener reuses the same profile and the same cleanup
+        atexit.register(_stop_soffice_listener)
+    profile = _soffice_profile_dir().as_uri()
+    _soffice_proc = subprocess.Popen(
+        [libreoffice, "--headless", "--invisible", "--norestore", "--nologo",
+         "--nofirststartwizard",
+         f"--accept=pipe,name={SOFFICE_PIPE};urp;",
+         f"-env:UserInstallation={profile}"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+def _uno_connect(libreoffice: str):
+    """Connect to the listener over UNO, waiting for it to come up."""
+    global _uno_desktop
+    if _uno_desktop is not None:
+        return _uno_desktop
+    
+    import uno
+    from com.sun.star.connection import NoConnectException
+    
+    _ensure_soffice_listener(libreoffice)
+    local = uno.getComponentContext()
+    resolver = local.ServiceManager.createInstanceWithContext(
+        "com.sun.star.bridge.UnoUrlResolver", local)
+    url = f"uno:pipe,name={SOFFICE_PIPE};urp;StarOffice.ComponentContext"
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            ctx = resolver.resolve(url)
+            break
+        except NoConnectException:
+            if time.monotonic() > deadline or _soffice_proc.poll() is not None:
+                raise RuntimeError("LibreOffice listener did not start")
+            time.sleep(0.25)
+    
+    _uno_desktop = ctx.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+    return _uno_desktop
+
+def _uno_props(**props) -> tuple:
+    """Build a UNO PropertyValue tuple from keyword arguments."""
+    import uno
+    values = []
+    for name, value in props.items():
+        prop = uno.createUnoStruct("com.sun.star.beans.PropertyValue")
+        prop.Name = name
+        prop.Value = value
+        values.append(prop)
+    return tuple(values)
+
+def _soffice_convert_via_uno(libreoffice: str, inp: str, out: str) -> None:
+    """Convert a document to PDF through the running LibreOffice listener."""
+    import uno
+    desktop = _uno_connect(libreoffice)
+    doc = desktop.loadComponentFromURL(
+        uno.systemPathToFileUrl(os.path.abspath(inp)), "_blank", 0, _uno_props(Hidden=True))
+    if doc is None:
+        raise RuntimeError(f"LibreOffice could not open {inp}")
+    try:
+        doc.storeToURL(uno.systemPathToFileUrl(os.path.abspath(out)),
+                       _uno_props(FilterName="writer_pdf_Export"))
+    finally:
+        doc.close(True)
+
+def _soffice_convert_cli(libreoffice: str, inp: str, out: str) -> None:
+    """Convert a document to PDF with a one-off soffice --convert-to run."""
+    outdir = os.path.dirname(os.path.abspath(out)) or "."
+    basename = Path(inp).stem
+    
+    returncode, stderr = run_tool(
+        [libreoffice, "--headless", "--convert-to", "pdf", inp, "--outdir", outdir])
+    
+    if returncode != 0:
+        raise RuntimeError(f"LibreOffice conversion failed: {stderr}")
+    
+    generated = os.path.join(outdir, f"{basename}.pdf")
+    if generated != out and os.path.exists(generated):
+        shutil.move(generated, out)
+
+def convert_docx_to_pdf_linux(inp: str, out: str) -> None:
+    """Convert DOCX to PDF using LibreOffice (Linux/Mac).
+    
+    With python3-uno available, every call reuses one listener process
+    instead of paying soffice startup per file.
+    """
+    global _uno_desktop
+    libreoffice = find_libreoffice()
+    
+    with _soffice_lock:
+        if check_import("uno"):
+            try:
+                _soffice_convert_via_uno(libreoffice, inp, out)
+                return
+            except Exception:
+                # Listener went away or refused the file; retry the slow way
+                _uno_desktop = None
+        _soffice_convert_cli(libreoffice, inp, out)
+
+def batch_docx_to_pdf(inputs: List[str], outdir: str) -> List[str]:
+    """Convert many documents to PDF in a single soffice invocation."""
+    libreoffice = find_libreoffice()
+    ensure_dir(outdir)
+    
+    with _soffice_lock:
+        returncode, stderr = run_tool(
+            [libreoffice, "--headless", "--convert-to", "pdf", "--outdir", outdir, *inputs])
+    
+    if returncode != 0:
+        raise RuntimeError(f"LibreOffice conversion failed: {stderr}")
+    
+    return [os.path.join(outdir, f"{stem_of(f)}.pdf") for f in inputs]
+
+def convert_docx_to_pdf(inp: str, out: str) -> None:
+    """Route DOCX→PDF conversion based on platform."""
+    if IS_LINUX or IS_MAC:
+        convert_docx_to_pdf_linux(inp, out)
+    elif IS_WINDOWS:
+        convert_docx_to_pdf_windows(inp, out)
+    else:
+        convert_docx_to_pdf_linux(inp, out)
+
+def convert_doc_to_pdf(inp: str, out: str) -> None:
+    """Convert DOC to PDF."""
+    if IS_WINDOWS:
+        try:
+            import win32com.client
+            word = win32com.client.Dispatch("Word.Application")
+            word.Visible = False
+            doc = word.Documents.Open(os.path.abspath(inp))
+            doc.SaveAs(os.path.abspath(out), 17)
+            doc.Close()
+            word.Quit()
+        except ImportError:
+            raise RuntimeError("pywin32 not installed. Run: pip install pywin32")
+        except Exception as e:
+            raise RuntimeError(f"Word automation failed: {e}")
+    else:
+        if which("libreoffice") or which("soffice"):
+            convert_docx_to_pdf_linux(inp, out)
+        else:
+            raise RuntimeError("DOC conversion requires LibreOffice on Linux/Mac")
+
+def convert_pdf_to_docx(inp: str, out: str) -> None:
+    """Convert PDF to DOCX."""
+    _require(Converter, "pdf2docx")
+    cv = Converter(inp) if isinstance(inp, str) else Converter(stream=inp.getvalue())
+    cv.convert(out, start=0, end=None)
+    cv.close()
+
+# PDF writers emit each object with its own write(); a large buffer batches them
+WRITE_BUFFER = 1 << 20
+
+# Fixed page layout for plain text: A4, Helvetica 12pt, 14pt leading,
+# 40pt margins (what the old ReportLab-based converter produced)
+TEXT_PAGE_SIZE = (595.2756, 841.8898)
+TEXT_MARGIN = 40
+TEXT_FONT_SIZE = 12
+TEXT_LEADING = 14
+TEXT_WRAP = 100
+TEXT_LINES_PER_PAGE = int((TEXT_PAGE_SIZE[1] - 2 * TEXT_MARGIN) // TEXT_LEADING) + 1
+
+def _pdf_text_literal(line: str) -> bytes:
+    """Encode one line as a PDF string literal for a WinAnsi Type1 font."""
+    raw = line.encode("cp1252", errors="replace")
+    return b"(" + raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+def _write_text_pdf(lines, f) -> None:
+    """Write lines as a minimal PDF using the built-in Helvetica font.
+    
+    With one page size and one base-14 font there is no layout to do, so
+    the objects are emitted directly instead of going through ReportLab.
+    """
+    width, height = TEXT_PAGE_SIZE
+    offsets = {}
+    pos = 0
+    
+    def emit(data: bytes) -> None:
+        nonlocal pos
+        f.write(data)
+        pos += len(data)
+    
+    def emit_obj(num: int, body: bytes) -> None:
+        offsets[num] = pos
+        emit(b"%d 0 obj\n" % num + body + b"\nendobj\n")
+    
+    def emit_page(page_lines: List[bytes]) -> None:
+        content = zlib.compress(b"BT\n/F1 %d Tf\n%d TL\n%d %.2f Td\n" % (
+            TEXT_FONT_SIZE, TEXT_LEADING, TEXT_MARGIN, height - TEXT_MARGIN)
+            + b"".join(text + b" Tj T*\n" for text in page_lines) + b"ET")
+        num = len(offsets) + 1
+        emit_obj(num, b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(content)
+                 + content + b"\nendstream")
+        emit_obj(num + 1, b"<< /Type /Page /Parent 2 0 R /Contents %d 0 R >>" % num)
+        page_nums.append(num + 1)
+    
+    emit(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets[1] = offsets[2] = 0  # catalog and page tree are written last
+    emit_obj(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+                b"/Encoding /WinAnsiEncoding >>")
+    
+    page_nums = []
+    page_lines = []
+    for line in lines:
+        page_lines.append(_pdf_text_literal(line))
+        if len(page_lines) == TEXT_LINES_PER_PAGE:
+            emit_page(page_lines)
+            page_lines = []
+    if page_lines or not page_nums:
+        emit_page(page_lines)
+    
+    kids = b" ".join(b"%d 0 R" % n for n in page_nums)
+    emit_obj(2, b"<< /Type /Pages /Kids [%s] /Count %d /MediaBox [0 0 %.4f %.4f] "
+                b"/Resources << /Font << /F1 3 0 R >> >> >>"
+                % (kids, len(page_nums), width, height))
+    emit_obj(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+    
+    xref = pos
+    size = len(offsets) + 1
+    emit(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+    emit(b"".join(b"%010d 00000 n \n" % offsets[n] for n in range(1, size)))
+    emit(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref))
+
+def _wrapped_lines(f):
+    """Yield the lines of a text file wrapped at TEXT_WRAP characters."""
+    for line in f:
+        yield from textwrap.wrap(line.rstrip(), TEXT_WRAP, break_long_words=False) or ['']
+
+def txt_to_pdf(inp: str, out: str) -> None:
+    """Convert TXT to PDF."""
+    try:
+        with open(inp, 'r', encoding='utf-8', errors='ignore') as src:
+            if isinstance(out, str):
+                with open(out, 'wb', buffering=WRITE_BUFFER) as f:
+                    _write_text_pdf(_wrapped_lines(src), f)
+            else:
+                _write_text_pdf(_wrapped_lines(src), out)
+    except Exception as e:
+        raise RuntimeError(f"Text conversion failed: {e}")
+
+def md_to_pdf(inp: str, out: str) -> None:
+    """Convert Markdown to PDF using Pandoc."""
+    pandoc = which("pandoc")
+    if not pandoc:
+        raise RuntimeError("Pandoc not found. Install from https://pandoc.org")
+    
+    returncode, _ = run_tool([pandoc, inp, "-o", out, "--pdf-engine=xelatex"])
+    
+    if returncode != 0:
+        returncode, stderr = run_tool([pandoc, inp, "-o", out])
+        if returncode != 0:
+            raise RuntimeError(f"Pandoc failed: {stderr}")
+#image#
+
+def image_to_pdf(inp: Union[str, List[str]], out: str, max_dim: Optional[int] = None) -> None:
+    """Convert an image, or a list of images, to a PDF with one page each.
+    
+    Pass max_dim to downscale images larger than that many pixels on a side
+    before embedding (their pages shrink with them); by default every image
+    keeps its full resolution.
+    """
+    _require(Image, "Pillow")
+    sources = inp if isinstance(inp, list) else [inp]
+    
+    pages = []
+    for src in sources:
+        with Image.open(src) as im:
+            if im.mode == "P":
+                page = im.convert("RGBA" if "transparency" in im.info else "RGB")
+            else:
+                page = im
+            if max_dim:
+                page.thumbnail((max_dim, max_dim), Image.LANCZOS)
+            # Keep a decoded copy so the file closes before the next one opens
+            if page is im:
+                page = im.copy()
+        if page.mode == "RGBA":
+            page = page.convert("RGB")
+        pages.append(page)
+    
+    pages[0].save(out, "PDF", resolution=100.0, save_all=True, append_images=pages[1:])
+
+# Formats libvips loads and saves natively (BMP would need ImageMagick)
+VIPS_FORMATS = ("png", "jpg", "jpeg", "webp", "tif", "tiff")
+
+def _vips_convert(inp: str, out: str) -> None:
+    """Convert with libvips, streaming the image instead of decoding it whole."""
+    img = pyvips.Image.new_from_file(inp, access="sequential")
+    if out.lower().endswith(('.jpg', '.jpeg')) and img.hasalpha():
+        img = img.flatten(background=[255, 255, 255])
+    img.write_to_file(out)
+
+GM_FORMATS = VIPS_FORMATS + ("bmp",)
+
+@functools.lru_cache(maxsize=None)
+def _image_backend() -> str:
+    """Pick the fastest image converter present: libvips, GraphicsMagick, Pillow.
+    
+    After cache_clear() (e.g. once packages were installed) the pick runs
+    again, retrying a pyvips import that failed at module load.
+    """
+    global pyvips
+    if pyvips is None:
+        try:
+            import pyvips
+        except (ImportError, OSError):
+            pass
+    if pyvips is not None:
+        return "vips"
+    if which("gm"):
+        return "gm"
+    return "pil"
+
+def _gm_convert(inp: str, out: str) -> bool:
+    """Convert with GraphicsMagick; False if gm could not handle the file."""
+    to_jpeg = out.lower().endswith(('.jpg', '.jpeg'))
+    flatten = ["-background", "white", "-flatten"] if to_jpeg else []
+    returncode, _ = run_tool([which("gm"), "convert", inp, *flatten, out])
+    return returncode == 0
+
+def image_convert(inp: str, out: str) -> None:
+    """Convert between image formats."""
+    backend = _image_backend()
+    if backend != "pil" and isinstance(inp, str) and isinstance(out, str):
+        src, dst = ext_of(inp), ext_of(out)
+        if backend == "vips" and src in VIPS_FORMATS and dst in VIPS_FORMATS:
+            try:
+                _vips_convert(inp, out)
+                return
+            except pyvips.Error:
+                pass  # let Pillow try files libvips could not read
+        elif backend == "gm" and src in GM_FORMATS and dst in GM_FORMATS:
+            if _gm_convert(inp, out):
+                return
+    
+    _require(Image, "Pillow")
+    im = Image.open(inp)
+    
+    if _name_of(out).lower().endswith(('.jpg', '.jpeg')):
+        if im.mode == "P":
+            # Only palettes with a transparent entry need the alpha path
+            im = im.convert("RGBA" if "transparency" in im.info else "RGB")
+        if im.mode == "RGBA":
+            background = Image.new("RGB", im.size, (255, 255, 255))
+            background.paste(im, mask=im.getchannel("A"))
+            im = background
+    
+    im.save(out)
+
+POPPLER_PAGE_BATCH = 16
+
+_page_workers: Optional[int] = None
+
+@contextmanager
+def page_worker_scope(workers: int):
+    """Cap the threads each pdf_to_images call uses, e.g. inside a batch.
+    
+    A batch already runs one PDF per worker; without the cap every one of
+    them would start its own cpu_count pdftoppm runs.
+    """
+    global _page_workers
+    previous = _page_workers
+    _page_workers = workers
+    try:
+        yield
+    finally:
+        _page_workers = previous
+
+def _page_pool_size() -> int:
+    """Threads (and so pdftoppm runs) a single pdf_to_images call may use."""
+    return _page_workers or os.cpu_count() or 1
+
+# Encoder settings for rendered pages: quick PNG deflate, JPEG at q85 4:2:0
+PAGE_SAVE_OPTIONS = {
+    "JPEG": {"quality": 85, "subsampling": 2},
+    "PNG": {"compress_level": 1},
+}
+
+
+def _page_output_path(out_pattern: str, fmt: str, page: int) -> str:
+    """Output file name for one rendered page."""
+    if "{page}" in out_pattern:
+        base = out_pattern.replace(f"{{page}}.{fmt}", "").replace(f".{fmt}", "")
+        return f"{base}_{page:03d}.{fmt}"
+    return out_pattern.format(page=page)
+
+def _pdf_page_count(pdfinfo: str, inp: str) -> int:
+    """Read the page count of a PDF with pdfinfo."""
+    result = subprocess.run([pdfinfo, inp], capture_output=True, text=True)
+    for line in result.stdout.splitlines():
+        if line.startswith("Pages:"):
+            return int(line.split()[1])
+    raise RuntimeError(f"pdfinfo failed: {result.stderr}")
+
+def _pdftoppm_range(pdftoppm: str, inp: str, fmt: str, first: int, last: int, prefix: str) -> None:
+    """Render pages first..last of inp straight to image files."""
+    returncode, stderr = run_tool(
+        [pdftoppm, "-r", "200",
+         *(["-jpeg", "-jpegopt", "quality=85"] if fmt in ("jpg", "jpeg") else ["-png"]),
+         "-f", str(first), "-l", str(last), inp, prefix])
+    if returncode != 0:
+        raise RuntimeError(f"pdftoppm failed: {stderr}")
+
+def _pdf_to_images_pdftoppm(pdftoppm: str, pdfinfo: str, inp, out_pattern: str, fmt: str) -> None:
+    """Rasterize with pdftoppm, spreading page ranges over parallel runs."""
+    with tempfile.TemporaryDirectory() as tmp:
+        if not isinstance(inp, str):
+            src = os.path.join(tmp, "input.pdf")
+            with open(src, "wb") as f:
+                f.write(inp.getvalue())
+            inp = src
+        
+        pages = _pdf_page_count(pdfinfo, inp)
+        prefix = os.path.join(tmp, "page")
+        ranges = [(lo, min(lo + POPPLER_PAGE_BATCH - 1, pages))
+                  for lo in range(1, pages + 1, POPPLER_PAGE_BATCH)]
+        with ThreadPoolExecutor(max_workers=_page_pool_size()) as ex:
+            # list() re-raises the first failure from any worker
+            list(ex.map(lambda r: _pdftoppm_range(pdftoppm, inp, fmt, r[0], r[1], prefix), ranges))
+        
+        # pdftoppm names pages prefix-N.png / prefix-N.jpg with variable padding
+        for name in os.listdir(tmp):
+            match = re.match(r"page-(\d+)\.(png|jpg)$", name)
+            if match:
+                out_path = _page_output_path(out_pattern, fmt, int(match.group(1)))
+                shutil.move(os.path.join(tmp, name), out_path)
+
+def pdf_to_images(inp: str, out_pattern: str) -> None:
+    """Convert PDF to images."""
+    fmt = ext_of(out_pattern) or "png"
+    
+    pdftoppm = _poppler_tool("pdftoppm")
+    pdfinfo = _poppler_tool("pdfinfo")
+    if pdftoppm and pdfinfo:
+        _pdf_to_images_pdftoppm(pdftoppm, pdfinfo, inp, out_pattern, fmt)
+        return
+    
+    _require(convert_from_path, "pdf2image")
+    # pdf2image splits the page range across this many pdftoppm processes
+    kwargs = {'thread_count': _page_pool_size()}
+    poppler_dir = _poppler_dir()
+    if poppler_dir:
+        kwargs['poppler_path'] = poppler_dir
+    
+    try:
+        if isinstance(inp, str):
+            pages = convert_from_path(inp, dpi=200, **kwargs)
+        else:
+            pages = convert_from_bytes(inp.getvalue(), dpi=200, **kwargs)
+    except PDFInfoNotInstalledError:
+        if IS_WINDOWS:
+            raise RuntimeError("Poppler not found. Install: choco install poppler")
+        else:
+            raise RuntimeError("poppler not installed. Install: sudo apt install poppler-utils")
+    except Exception as e:
+        raise RuntimeError(f"PDF conversion failed: {e}")
+    
+    fmt_name = "JPEG" if fmt in ("jpg", "jpeg") else fmt.upper()
+    save_kwargs = PAGE_SAVE_OPTIONS.get(fmt_name, {})
+    
+    def save_page(item):
+        i, page = item
+        page.save(_page_output_path(out_pattern, fmt, i), fmt_name, **save_kwargs)
+    
+    # Pillow's encoders release the GIL, so pages encode in parallel
+    with ThreadPoolExecutor(max_workers=_page_pool_size()) as ex:
+        list(ex.map(save_page, enumerate(pages, 1)))
+
+#pdf section
+
+def merge_pdfs(inputs: List[str], out: str) -> None:
+    """Merge multiple PDFs into one."""
+    if len(inputs) < 2:
+        raise ValueError("Need at least 2 files to merge")
+    
+    for f in inputs:
+        if not _cached_exists(f):
+            raise FileNotFoundError(f"File not found: {f}")
+    
+    if pikepdf is not None:
+        # Read and parse the inputs in parallel (libqpdf releases the GIL);
+        # pages are still appended in order by this thread alone
+        with ThreadPoolExecutor(max_workers=min(4, len(inputs))) as ex:
+            futures = [ex.submit(pikepdf.open, f) for f in inputs]
+        try:
+            with pikepdf.new() as merged:
+                for fut in futures:
+                    merged.pages.extend(fut.result().pages)
+                merged.save(out, compress_streams=True,
+                            object_stream_mode=pikepdf.ObjectStreamMode.generate)
+        finally:
+            for fut in futures:
+                if fut.exception() is None:
+                    fut.result().close()
+        return
+    
+    _require(PdfWriter, "pypdf")
+    
+    writer = PdfWriter()
+    for f in inputs:
+        writer.append(f)
+    with open(out, "wb", buffering=WRITE_BUFFER) as f:
+        writer.write(f)
+
+# Threads that write split pages to disk while the next pages serialize
+SPLIT_WRITERS = 4
+SPLIT_QUEUE = 32
+
+def _write_split_pages(outdir: str, pages: Iterable[bytes]) -> int:
+    """Write page_001.pdf, page_002.pdf, ... from serialized pages; return the count.
+    
+    Serializing stays on the calling thread (pypdf needs the GIL for it),
+    while writer threads drain a bounded queue to disk in the meantime.
+    """
+    pending = queue.Queue(maxsize=SPLIT_QUEUE)
+    errors = []
+    
+    def writer():
+        while True:
+            item = pending.get()
+            if item is None:
+                return
+            number, data = item
+            try:
+                with open(os.path.join(outdir, f"page_{number:03d}.pdf"), "wb") as f:
+                    f.write(data)
+            except OSError as e:
+                errors.append(e)
+    
+    threads = [threading.Thread(target=writer, daemon=True) for _ in range(SPLIT_WRITERS)]
+    for t in threads:
+        t.start()
+    count = 0
+    try:
+        for count, data in enumerate(pages, 1):
+            if errors:
+                break
+            pending.put((count, data))
+    finally:
+        for _ in threads:
+            pending.put(None)
+        for t in threads:
+            t.join()
+    if errors:
+        raise errors[0]
+    return count
+
+def _pikepdf_pages(pdf) -> Iterable[bytes]:
+    """Each page of an open pikepdf document as a standalone PDF."""
+    for page in pdf.pages:
+        # qpdf copies the page and only the objects it references, in C++
+        with pikepdf.new() as dst:
+            dst.pages.append(page)
+            buf = io.BytesIO()
+            dst.save(buf)
+        yield buf.getvalue()
+
+def _pypdf_pages(reader) -> Iterable[bytes]:
+    """Each page of a PdfReader as a standalone PDF."""
+    for page in reader.pages:
+        writer = PdfWriter()
+        writer.add_page(page)
+        buf = io.BytesIO()
+        writer.write(buf)
+        yield buf.getvalue()
+
+def split_pdf(inp: str, outdir: str) -> None:
+    """Split PDF into individual pages."""
+    if not _cached_exists(inp):
+        raise FileNotFoundError(f"File not found: {inp}")
+    
+    ensure_dir(outdir)
+    
+    if pikepdf is not None:
+        with pikepdf.open(inp) as pdf:
+            count = _write_split_pages(outdir, _pikepdf_pages(pdf))
+        print(f"✅ Split into {count} pages in {outdir}")
+        return
+    
+    _require(PdfWriter, "pypdf")
+    
+    count = _write_split_pages(outdir, _pypdf_pages(PdfReader(inp)))
+    print(f"✅ Split into {count} pages in {outdir}")
+
+def compress_pdf(inp: str, out: str) -> None:
+    """Compress PDF file size."""
+    if not _cached_exists(inp):
+        raise FileNotFoundError(f"File not found: {inp}")
+    
+    if pikepdf is not None:
+        with pikepdf.open(inp) as pdf:
+            pdf.save(out, compress_streams=True, recompress_flate=True,
+                     stream_decode_level=pikepdf.StreamDecodeLevel.generalized,
+                     object_stream_mode=pikepdf.ObjectStreamMode.generate)
+        return
+    
+    _require(PdfWriter, "pypdf")
+    
+    reader = PdfReader(inp)
+    writer = PdfWriter()
+    
+    for page in reader.pages:
+        writer.add_page(page)
+    # pypdf can only compress pages that already belong to a writer
+    for page in writer.pages:
+        page.compress_content_streams()
+    
+    with open(out, "wb", buffering=WRITE_BUFFER) as f:
+        writer.write(f)
+
+def rotate_pdf(inp: str, out: str, deg: int) -> None:
+    """Rotate PDF pages."""
+    if not _cached_exists(inp):
+        raise FileNotFoundError(f"File not found: {inp}")
+    
+    deg = ((deg % 360) // 90) * 90
+    if deg < 0:
+        deg += 360
+    
+    if pikepdf is not None:
+        with pikepdf.open(inp) as pdf:
+            for page in pdf.pages:
+                page.rotate(deg, relative=True)
+            pdf.save(out)
+        return
+    
+    _require(PdfWriter, "pypdf")
+    
+    reader = PdfReader(inp)
+    writer = PdfWriter()
+    
+    for page in reader.pages:
+        page.rotate(deg)
+        writer.add_page(page)
+    
+    with open(out, "wb", buffering=WRITE_BUFFER) as f:
+        writer.write(f)
+
+@functools.lru_cache(maxsize=16)
+def _watermark_page(text: str) -> bytes:
+    """Render the one-page watermark PDF for text (cached across calls)."""
+    packet = io.BytesIO()
+    c = canvas.Canvas(packet, pagesize=A4)
+    c.setFont("Helvetica", 60)
+    c.setFillColorRGB(0.5, 0.5, 0.5, alpha=0.3)
+    c.saveState()
+    c.translate(300, 400)
+    c.rotate(45)
+    c.drawCentredString(0, 0, text)
+    c.restoreState()
+    c.save()
+    return packet.getvalue()
+
+def watermark_pdf(inp: str, out: str, text: str) -> None:
+    """Add text watermark to PDF."""
+    _require(canvas, "reportlab")
+    
+    if not _cached_exists(inp):
+        raise FileNotFoundError(f"File not found: {inp}")
+    
+    packet = io.BytesIO(_watermark_page(text))
+    
+    if pikepdf is not None:
+        with pikepdf.open(packet) as wm_pdf, pikepdf.open(inp) as pdf:
+            # Copy the watermark in once as a Form XObject; each page then
+            # only draws it by name instead of carrying its own copy
+            form = pdf.copy_foreign(wm_pdf.pages[0].as_form_xobject())
+            for page in pdf.pages:
+                page.add_overlay(form)
+            pdf.save(out)
+        return
+    
+    _require(PdfWriter, "pypdf")
+    
+    watermark = PdfReader(packet)
+    reader = PdfReader(inp)
+    writer = PdfWriter()
+    
+    for page in reader.pages:
+        page.merge_page(watermark.pages[0])
+        writer.add_page(page)
+    
+    with open(out, "wb", buffering=WRITE_BUFFER) as f:
+        writer.write(f)
+
+# media 
+
+# Audio codecs a target container can take unchanged, so FFmpeg can
+# stream-copy instead of decoding and re-encoding
+STREAM_COPY_AUDIO = {
+    "mp3": {"mp3"},
+    "wav": {"pcm_s16le"},
+}
+
+def _probe_codecs(inp: str) -> dict:
+    """Map stream type (audio/video) to codec names using ffprobe."""
+    ffprobe = which("ffprobe")
+    if not ffprobe:
+        return {}
+    
+    result = subprocess.run(
+        [ffprobe, "-v", "quiet", "-print_format", "json", "-show_streams", inp],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        return {}
+    try:
+        streams = json.loads(result.stdout).get("streams", [])
+    except ValueError:
+        return {}
+    
+    codecs = {}
+    for stream in streams:
+        codecs.setdefault(stream.get("codec_type"), []).append(stream.get("codec_name"))
+    return codecs
+
+def _ffmpeg_codec_args(inp: str, out: str) -> List[str]:
+    """Extra FFmpeg arguments: stream-copy the audio when no re-encode is needed."""
+    dst = ext_of(out)
+    if dst not in STREAM_COPY_AUDIO:
+        return []
+    audio = _probe_codecs(inp).get("audio", [])
+    if audio and audio[0] in STREAM_COPY_AUDIO[dst]:
+        return ["-vn", "-c:a", "copy"]
+    return []
+
+def media_convert(inp: str, out: str) -> None:
+    """Convert media files using FFmpeg."""
+    ffmpeg = which("ffmpeg")
+    if not ffmpeg:
+        raise RuntimeError("FFmpeg not found. Install from https://ffmpeg.org")
+    
+    if not _cached_exists(inp):
+        raise FileNotFoundError(f"File not found: {inp}")
+    
+    returncode, stderr = run_tool([ffmpeg, "-y", "-i", inp, *_ffmpeg_codec_args(inp, out), out])
+    
+    if returncode != 0:
+        raise RuntimeError(f"FFmpeg failed: {stderr}")
+
+CONVERTERS = {
+    ("pdf", "docx"): convert_pdf_to_docx,
+    ("docx", "pdf"): convert_docx_to_pdf,
+    ("doc", "pdf"): convert_doc_to_pdf,
+    ("txt", "pdf"): txt_to_pdf,
+    ("md", "pdf"): md_to_pdf,
+    ("png", "pdf"): image_to_pdf,
+    ("jpg", "pdf"): image_to_pdf,
+    ("jpeg", "pdf"): image_to_pdf,
+    ("bmp", "pdf"): image_to_pdf,
+    ("webp", "pdf"): image_to_pdf,
+    ("pdf", "png"): lambda i, o: pdf_to_images(i, o.replace(".png", "_{page:03d}.png")),
+    ("pdf", "jpg"): lambda i, o: pdf_to_images(i, o.replace(".jpg", "_{page:03d}.jpg")),
+    ("pdf", "jpeg"): lambda i, o: pdf_to_images(i, o.replace(".jpeg", "_{page:03d}.jpeg")),
+    ("png", "jpg"): image_convert,
+    ("png", "jpeg"): image_convert,
+    ("jpg", "png"): image_convert,
+    ("jpeg", "png"): image_convert,
+    ("bmp", "png"): image_convert,
+    ("webp", "png"): image_convert,
+    ("mp4", "mp3"): media_convert,
+    ("wav", "mp3"): media_convert,
+    ("mp4", "wav"): media_convert,
+}
+
+# Handlers that also take a named io.BytesIO in place of a path, so a
+# chained conversion can hand its intermediate result over in memory
+STREAM_INPUT = {
+    key for key, handler in CONVERTERS.items()
+    if handler in (image_to_pdf, image_convert, convert_pdf_to_docx)
+} | {("pdf", "png"), ("pdf", "jpg"), ("pdf", "jpeg")}
+STREAM_OUTPUT = {
+    key for key, handler in CONVERTERS.items()
+    if handler in (image_to_pdf, image_convert, txt_to_pdf)
+}
+
+def _norm_fmt(fmt: str) -> str:
+    """Normalize a format name so jpeg and jpg share one graph node."""
+    return "jpg" if fmt == "jpeg" else fmt
+
+def _build_graph() -> dict:
+    """Adjacency list of formats, built from the CONVERTERS table."""
+    graph = defaultdict(list)
+    for src, dst in CONVERTERS:
+        src, dst = _norm_fmt(src), _norm_fmt(dst)
+        if dst not in graph[src]:
+            graph[src].append(dst)
+    return graph
+
+GRAPH = _build_graph()
+
+# PDF -> image writes one file per page, so it can only be the last step
+PAGED_EDGES = {("pdf", "png"), ("pdf", "jpg")}
+
+def _bfs_chain(src: str, dst: str, allow_paged: bool) -> Optional[Tuple[Tuple[str, str], ...]]:
+    """Breadth-first search for the shortest chain of conversion steps."""
+    queue = deque([(src, ())])
+    seen = {src}
+    while queue:
+        node, path = queue.popleft()
+        for nb in GRAPH.get(node, ()):
+            step = (node, nb)
+            if step in PAGED_EDGES and not (allow_paged and nb == dst):
+                continue
+            if nb == dst:
+                return path + (step,)
+            if nb not in seen:
+                seen.add(nb)
+                queue.append((nb, path + (step,)))
+    return None
+
+@functools.lru_cache(maxsize=256)
+def find_chain(src: str, dst: str) -> Optional[Tuple[Tuple[str, str], ...]]:
+    """Find the shortest multi-step conversion chain from src to dst."""
+    src, dst = _norm_fmt(src), _norm_fmt(dst)
+    if src == dst:
+        return None
+    # Prefer chains that end in a single file over paged image output
+    return _bfs_chain(src, dst, allow_paged=False) or _bfs_chain(src, dst, allow_paged=True)
+
+def dispatch(src: str, dst: str, inp: str, out: str) -> None:
+    """Route conversion to appropriate handler."""
+    src = _norm_fmt(src.lower().lstrip("."))
+    dst = _norm_fmt(dst.lower().lstrip("."))
+    
+    key = (src, dst)
+    
+    if key in CONVERTERS:
+        handler = CONVERTERS[key]
+        handler(inp, out)
+        return
+    
+    raise ValueError(f"No handler for {src} -> {dst}")
+
+@functools.lru_cache(maxsize=64)
+def _resolve(src: str, dst: str) -> Optional[Tuple[Tuple[str, str, Callable], ...]]:
+    """Plan the (from, to, handler) steps for an extension pair, once per pair."""
+    src, dst = _norm_fmt(src), _norm_fmt(dst)
+    if (src, dst) in CONVERTERS:
+        return ((src, dst, CONVERTERS[(src, dst)]),)
+    chain = find_chain(src, dst)
+    if not chain:
+        return None
+    return tuple((a, b, CONVERTERS[(a, b)]) for a, b in chain)
+
+def convert_file(inp: str, out: str, src_fmt: Optional[str] = None) -> bool:
+    """Convert single file with error handling.
+    
+    src_fmt overrides the input's extension, e.g. for a mislabelled file.
+    """
+    src = src_fmt or ext_of(inp)
+    dst = ext_of(out)
+    
+    try:
+        if not src and os.path.isfile(inp):
+            src = file_context(inp).fmt
+        steps = _resolve(src, dst)
+        if steps is None:
+            raise ValueError(f"Unsupported conversion: {src} -> {dst}")
+        
+        temp_files = []
+        try:
+            current_input = inp
+            for i, (from_fmt, to_fmt, handler) in enumerate(steps):
+                if i == len(steps) - 1:
+                    current_output = out
+                elif (from_fmt, to_fmt) in STREAM_OUTPUT and steps[i + 1][:2] in STREAM_INPUT:
+                    current_output = io.BytesIO()
+                    current_output.name = f"chain_{i}.{to_fmt}"
+                else:
+                    # A unique name, so conversions of the same input can run at once
+                    fd, temp = tempfile.mkstemp(prefix=f"{stem_of(inp)}.tmp_{i}_",
+                                                suffix=f".{to_fmt}")
+                    os.close(fd)
+                    temp_files.append(temp)
+                    current_output = temp
+                
+                handler(current_input, current_output)
+                if isinstance(current_output, io.BytesIO):
+                    current_output.seek(0)
+                current_input = current_output
+        finally:
+            for temp in temp_files:
+                safe_remove(temp)
+        
+        return True
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        return False
+
+def _convert_pair(pair: Tuple[str, str]) -> bool:
+    """Convert one (input, output) pair."""
+    return convert_file(*pair)
+
+def batch_pairs(inputs: List[str], out_ext: str,
+                outdir: Optional[str] = None) -> List[Tuple[str, str]]:
+    """Pair inputs with output paths, skipping inputs whose output name is taken.
+    
+    a.png and a.bmp would both become a.jpg; converting both at once would
+    race on the same file.
+    """
+    pairs = []
+    seen = set()
+    for inp in inputs:
+        out = get_output_path(inp, out_ext, outdir)
+        if out in seen:
+            print(f"⚠️  Skipping {inp}: {out} already comes from another input")
+            continue
+        seen.add(out)
+        pairs.append((inp, out))
+    return pairs
+
+def convertible_to(inputs: List[str], out_ext: str) -> List[str]:
+    """Keep only the inputs that have a conversion path to out_ext.
+    
+    Like convert_file, an input without an extension is judged by its
+    detected format.
+    """
+    def src_of(f: str) -> str:
+        src = ext_of(f)
+        if not src and os.path.isfile(f):
+            src = file_context(f).fmt
+        return src
+    return [f for f in inputs if _resolve(src_of(f), out_ext.lower()) is not None]
+
+def _office_pdf_groups(pairs: List[Tuple[str, str]]) -> dict:
+    """Group office→PDF pairs that one soffice run can handle, by output dir.
+
+    Only used when the UNO bridge is missing: with UNO every file already
+    goes through the shared listener, so there is no startup to amortize.
+    """
+    if IS_WINDOWS or check_import("uno") or not (which("libreoffice") or which("soffice")):
+        return {}
+    groups = defaultdict(list)
+    for i, (inp, out) in enumerate(pairs):
+        steps = _resolve(ext_of(inp), ext_of(out))
+        office = (convert_docx_to_pdf, convert_doc_to_pdf)
+        if not steps or len(steps) != 1 or steps[0][2] not in office:
+            continue
+        # soffice names its output after the input stem; only group pairs that match
+        outdir = os.path.dirname(os.path.abspath(out))
+        if os.path.join(outdir, f"{stem_of(inp)}.pdf") == os.path.abspath(out):
+            groups[outdir].append(i)
+    return groups
+
+def _convert_office_group(group: List[Tuple[str, str]], outdir: str) -> List[bool]:
+    """Convert a group from _office_pdf_groups and report per-file success."""
+    started = time.time()
+    try:
+        batch_docx_to_pdf([inp for inp, _ in group], outdir)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+    # soffice exits 0 even when single files fail, so check what it wrote
+    return [os.path.exists(out) and os.path.getmtime(out) >= started - 1 for _, out in group]
+
+# Media pairs one ffmpeg run converts at most, one output per input
+MEDIA_BATCH = 8
+MEDIA_AUDIO_OUTPUTS = {"mp3", "wav"}
+
+def _media_groups(pairs: List[Tuple[str, str]], workers: int) -> List[List[int]]:
+    """Chunk single-step audio-output media pairs so a chunk shares one ffmpeg."""
+    if not which("ffmpeg"):
+        return []
+    idxs = []
+    for i, (inp, out) in enumerate(pairs):
+        steps = _resolve(ext_of(inp), ext_of(out))
+        if (steps and len(steps) == 1 and steps[0][2] is media_convert
+                and steps[0][1] in MEDIA_AUDIO_OUTPUTS):
+            idxs.append(i)
+    if len(idxs) < 2:
+        return []
+    # Spread chunks over the workers first; only cap their size for big batches
+    size = min(MEDIA_BATCH, -(-len(idxs) // workers))
+    return [idxs[k:k + size] for k in range(0, len(idxs), size)] if size > 1 else []
+
+def _media_group_cmd(ffmpeg: str, group: List[Tuple[str, str]]) -> List[str]:
+    """One ffmpeg command that writes output n from input n alone."""
+    cmd = [ffmpeg, "-y"]
+    for inp, _ in group:
+        cmd += ["-i", inp]
+    for n, (inp, out) in enumerate(group):
+        # Explicit maps: automatic selection would pick from every input, and
+        # tags and chapters would otherwise all come from input 0
+        cmd += ["-map", f"{n}:a:0", "-map_metadata", str(n), "-map_chapters", str(n),
+                *_ffmpeg_codec_args(inp, out), out]
+    return cmd
+
+def _convert_media_group(group: List[Tuple[str, str]]) -> List[bool]:
+    """Convert a chunk from _media_groups in one ffmpeg run.
+    
+    ffmpeg aborts the whole run if any input is bad, so on failure the
+    chunk is redone file by file to find out which ones actually fail.
+    """
+    if all(_cached_exists(inp) for inp, _ in group):
+        returncode, _ = run_tool(_media_group_cmd(which("ffmpeg"), group))
+        if returncode == 0:
+            return [True] * len(group)
+    return [_convert_pair(pair) for pair in group]
+
+def _grouped_jobs(pairs: List[Tuple[str, str]], workers: int) -> List[Tuple[List[int], Callable]]:
+    """Pairs that share one tool run, as (pair indices, converter for the group)."""
+    jobs = [(idxs, functools.partial(_convert_office_group, outdir=outdir))
+            for outdir, idxs in _office_pdf_groups(pairs).items()]
+    jobs += [(idxs, _convert_media_group) for idxs in _media_groups(pairs, workers)]
+    return jobs
+
+def batch_convert(pairs: List[Tuple[str, str]], max_workers: Optional[int] = None,
+                  verified: bool = False) -> List[bool]:
+    """Convert many files concurrently.
+
+    Handlers wait on subprocesses or C code that releases the GIL, so a
+    thread pool overlaps them. Pass verified=True when the inputs were just
+    listed from disk so their existence checks can be skipped.
+    """
+    if not pairs:
+        return []
+    workers = max_workers or os.cpu_count() or 1
+    known = [inp for inp, _ in pairs] if verified else ()
+    results: List[bool] = [False] * len(pairs)
+    # Share the cores between the batch workers and each PDF's page renderers
+    page_workers = max(1, (os.cpu_count() or 1) // workers)
+    with stat_cache_scope(known), page_worker_scope(page_workers), \
+            ThreadPoolExecutor(max_workers=workers) as ex:
+        groups = _grouped_jobs(pairs, workers)
+        grouped = {i for idxs, _ in groups for i in idxs}
+        rest = [i for i in range(len(pairs)) if i not in grouped]
+        group_futs = [(idxs, ex.submit(convert, [pairs[i] for i in idxs]))
+                      for idxs, convert in groups]
+        done = tqdm(ex.map(_convert_pair, [pairs[i] for i in rest]), total=len(rest))
+        for i, ok in zip(rest, done):
+            results[i] = ok
+        for idxs, fut in group_futs:
+            for i, ok in zip(idxs, fut.result()):
+                results[i] = ok
+    return results
+
+# Manifest operations: each takes (input, output, arg); merge inputs are ;-separated
+MANIFEST_OPS = {
+    "convert": lambda inp, out, arg: convert_file(inp, out),
+    "merge": lambda inp, out, arg: merge_pdfs(inp.split(";"), out),
+    "split": lambda inp, out, arg: split_pdf(inp, out or "pages"),
+    "compress": lambda inp, out, arg: compress_pdf(inp, out),
+    "rotate": lambda inp, out, arg: rotate_pdf(inp, out, int(arg)),
+    "watermark": lambda inp, out, arg: watermark_pdf(inp, out, arg),
+}
+MANIFEST_NEEDS_ARG = {"rotate", "watermark"}
+
+# (line number, op, input, output, arg)
+ManifestJob = Tuple[int, str, str, str, Optional[str]]
+
+def read_manifest(path: str) -> List[ManifestJob]:
+    """Parse op,input,output[,arg] rows, skipping blank and # comment lines."""
+    jobs = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for line_no, row in enumerate(csv.reader(f), 1):
+            row = [cell.strip() for cell in row]
+            if not row or not row[0] or row[0].startswith("#"):
+                continue
+            op = row[0].lower()
+            if op not in MANIFEST_OPS:
+                raise ValueError(f"{path}:{line_no}: unknown operation '{row[0]}'")
+            inp = row[1] if len(row) > 1 else ""
+            out = row[2] if len(row) > 2 else ""
+            if not inp or (not out and op != "split"):
+                raise ValueError(f"{path}:{line_no}: expected {op},input,output")
+            arg = row[3] if len(row) > 3 and row[3] else None
+            if op in MANIFEST_NEEDS_ARG and arg is None:
+                raise ValueError(f"{path}:{line_no}: {op} needs a fourth column")
+            if op == "rotate":
+                try:
+                    int(arg)
+                except ValueError:
+                    raise ValueError(
+                        f"{path}:{line_no}: rotate needs whole degrees, got '{arg}'") from None
+            jobs.append((line_no, op, inp, out or ("pages" if op == "split" else ""), arg))
+    return jobs
+
+def _manifest_stages(jobs: List[ManifestJob]) -> List[int]:
+    """Stage number for each job: after every earlier job it conflicts with.
+    
+    A job waits for earlier jobs that write its input, that read the file it
+    writes, or that write the same file. A split writes a folder, so every
+    page inside it counts as its output; likewise a PDF to image conversion
+    writes stem_001.png, stem_002.png, ... next to its named output.
+    """
+    def norm(p: str) -> str:
+        return os.path.normcase(os.path.abspath(p))
+    
+    def output_kind(op: str, inp: str, out: str) -> str:
+        if op == "split":
+            return "folder"
+        if op == "convert":
+            steps = _resolve(ext_of(inp), ext_of(out))
+            if steps and steps[-1][:2] in PAGED_EDGES:
+                return "paged"
+        return "file"
+    
+    def hits(target: str, kind: str, path: str) -> bool:
+        """Whether path is target, or one of the files a folder or paged output stands for."""
+        if path == target:
+            return True
+        if kind == "folder":
+            return os.path.dirname(path) == target
+        if kind == "paged":
+            stem, ext = os.path.splitext(target)
+            page = path[len(stem) + 1:len(path) - len(ext)]
+            return path.startswith(stem + "_") and path.endswith(ext) and page.isdigit()
+        return False
+    
+    info = []
+    for _, op, inp, out, _ in jobs:
+        reads = [norm(p) for p in (inp.split(";") if op == "merge" else [inp])]
+        info.append((reads, norm(out), output_kind(op, inp, out)))
+    stages = []
+    for i, (reads, out, kind) in enumerate(info):
+        stage = 0
+        for j in range(i):
+            prev_reads, prev_out, prev_kind = info[j]
+            depends = (any(hits(prev_out, prev_kind, r) for r in reads)
+                       or any(hits(out, kind, r) for r in prev_reads)
+                       or hits(prev_out, prev_kind, out) or hits(out, kind, prev_out))
+            if depends:
+                stage = max(stage, stages[j] + 1)
+        stages.append(stage)
+    return stages
+
+def _run_manifest_job(job: ManifestJob) -> bool:
+    """Run one manifest row, reporting failures by line number."""
+    line_no, op, inp, out, arg = job
+    try:
+        return MANIFEST_OPS[op](inp, out, arg) is not False
+    except Exception as e:
+        print(f"\n❌ Line {line_no}: {e}")
+        return False
+
+def run_manifest(path: str, max_workers: Optional[int] = None) -> List[bool]:
+    """Run every row of a manifest in one process.
+    
+    Independent rows run concurrently; a row that conflicts with an earlier
+    row (see _manifest_stages) runs in a later stage, after it has finished.
+    """
+    jobs = read_manifest(path)
+    if not jobs:
+        return []
+    stages = _manifest_stages(jobs)
+    results: List[bool] = [False] * len(jobs)
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as ex:
+        for stage in range(max(stages) + 1):
+            idxs = [i for i, s in enumerate(stages) if s == stage]
+            for i, ok in zip(idxs, ex.map(_run_manifest_job, [jobs[i] for i in idxs])):
+                results[i] = ok
+    return results
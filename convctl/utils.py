@@ -0,0 +1,118 @@
+"""
+Shared helpers for the converter: platform flags, tool lookup and paths.
+
+Only the standard library is imported here, so the interactive menu can
+start without loading any converter backend.
+"""
+
+import os
+import glob
+import functools
+import platform
+import shutil
+import subprocess
+from typing import List, Tuple, Optional
+
+IS_LINUX = platform.system().lower() == "linux"
+IS_WINDOWS = platform.system().lower() == "windows"
+IS_MAC = platform.system().lower() == "darwin"
+
+@functools.lru_cache(maxsize=None)
+def which(cmd: str) -> Optional[str]:
+    """Find command in system PATH (cached for the session)."""
+    return shutil.which(cmd)
+
+def ensure_dir(path: str) -> None:
+    """Ensure directory exists."""
+    os.makedirs(path, exist_ok=True)
+
+def safe_remove(path: str) -> None:
+    """Safely remove file if it exists."""
+    try:
+        if os.path.exists(path):
+            os.remove(path)
+    except OSError:
+        pass
+
+STDERR_TAIL = 4096
+
+def run_tool(cmd: List[str]) -> Tuple[int, str]:
+    """Run an external tool and return (returncode, last 4 KB of stderr).
+    
+    stdout is discarded and stderr is drained into a bounded buffer, so
+    chatty tools (LibreOffice, FFmpeg) cannot pile up megabytes of warnings;
+    the tail is only decoded into text for error messages.
+    """
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    tail = bytearray()
+    with proc.stderr:
+        for chunk in iter(lambda: proc.stderr.read(65536), b""):
+            tail += chunk
+            del tail[:-STDERR_TAIL]
+    proc.wait()
+    return proc.returncode, tail.decode("utf-8", errors="replace")
+
+@functools.lru_cache(maxsize=None)
+def check_import(module_name: str) -> bool:
+    """Check if a module can be imported without crashing (cached)."""
+    import importlib.util
+    spec = importlib.util.find_spec(module_name)
+    return spec is not None
+
+
+def expand_inputs(pattern: str) -> List[str]:
+    """Expand a file path, directory or glob pattern into a sorted file list."""
+    if os.path.isdir(pattern):
+        return sorted(e.path for e in os.scandir(pattern) if e.is_file())
+    if any(ch in pattern for ch in "*?["):
+        return sorted(f for f in glob.glob(pattern) if os.path.isfile(f))
+    return [pattern] if os.path.exists(pattern) else []
+
+
+# Batch loops call these per file; plain os.path string ops avoid building
+# a Path object each time
+def ext_of(path: str) -> str:
+    """Lower-case extension of path without the dot ('' if none)."""
+    return os.path.splitext(path)[1][1:].lower()
+
+def stem_of(path: str) -> str:
+    """File name of path without directory or extension."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+def get_output_path(input_path: str, new_ext: str, outdir: Optional[str] = None) -> str:
+    """Generate output path based on input (optionally inside outdir)."""
+    # If new_ext doesn't start with dot, add it
+    if not new_ext.startswith('.'):
+        new_ext = '.' + new_ext
+    if outdir:
+        return os.path.join(outdir, stem_of(input_path) + new_ext)
+    return os.path.splitext(input_path)[0] + new_ext
+
+
+@functools.lru_cache(maxsize=None)
+def _poppler_dir() -> Optional[str]:
+    """Locate a Poppler bin directory that is not on PATH (Windows)."""
+    if not IS_WINDOWS:
+        return None
+    poppler_paths = [
+        r"C:\Program Files\poppler\bin",
+        r"C:\poppler\bin",
+        r"C:\Users\{}\poppler\bin".format(os.environ.get('USERNAME')),
+    ]
+    for path in poppler_paths:
+        if os.path.exists(path):
+            return path
+    return None
+
+def _poppler_tool(name: str) -> Optional[str]:
+    """Find a Poppler command-line tool such as pdftoppm."""
+    found = which(name)
+    if found:
+        return found
+    poppler_dir = _poppler_dir()
+    if poppler_dir:
+        candidate = os.path.join(poppler_dir, f"{name}.exe")
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
@@ -0,0 +1,49 @@
+import struct
+import zipfile
+
+from convctl.ops import _sniff_ext, convertible_to, file_context
+
+
+def _zip(path, member):
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr(member, "<x/>")
+    return str(path)
+
+
+def test_only_word_zips_sniff_as_docx(tmp_path):
+    assert _sniff_ext(_zip(tmp_path / "doc", "word/document.xml")) == "docx"
+    assert _sniff_ext(_zip(tmp_path / "book", "xl/workbook.xml")) is None
+
+
+def test_extensionless_docx_is_detected(tmp_path):
+    assert file_context(_zip(tmp_path / "report", "word/document.xml")).fmt == "docx"
+
+
+def test_archives_are_not_convertible(tmp_path):
+    archive = _zip(tmp_path / "archive.zip", "readme.txt")
+    sheet = _zip(tmp_path / "sheet.xlsx", "xl/workbook.xml")
+    doc = _zip(tmp_path / "report", "word/document.xml")
+    assert convertible_to([archive, sheet, doc], "pdf") == [doc]
+
+
+def _cfb(path, stream):
+    """Minimal compound file: header, one directory sector, one FAT sector."""
+    header = bytearray(512)
+    header[0:8] = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+    struct.pack_into("<HH", header, 26, 3, 0xFFFE)
+    struct.pack_into("<H", header, 30, 9)
+    struct.pack_into("<I", header, 48, 0)
+    struct.pack_into("<109I", header, 76, 1, *([0xFFFFFFFF] * 108))
+    directory = bytearray(512)
+    for i, (name, kind) in enumerate([("Root Entry", 5), (stream, 2)]):
+        encoded = (name + "\0").encode("utf-16-le")
+        directory[i * 128:i * 128 + len(encoded)] = encoded
+        struct.pack_into("<HB", directory, i * 128 + 64, len(encoded), kind)
+    fat = struct.pack("<2I", 0xFFFFFFFE, 0xFFFFFFFD) + b"\xff" * 504
+    path.write_bytes(bytes(header + directory) + fat)
+    return str(path)
+
+
+def test_only_word_compound_files_sniff_as_doc(tmp_path):
+    assert _sniff_ext(_cfb(tmp_path / "letter", "WordDocument")) == "doc"
+    assert _sniff_ext(_cfb(tmp_path / "budget", "Workbook")) is None
@@ -0,0 +1,13 @@
+from convctl.ops import find_chain
+
+
+def test_bmp_to_jpg_goes_through_png():
+    assert find_chain("bmp", "jpg") == (("bmp", "png"), ("png", "jpg"))
+
+
+def test_jpeg_is_normalized():
+    assert find_chain("bmp", "jpeg") == find_chain("bmp", "jpg")
+
+
+def test_same_format_has_no_chain():
+    assert find_chain("pdf", "pdf") is None
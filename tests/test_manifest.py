@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+from convctl.ops import _manifest_stages, read_manifest
+
+
+def _manifest(tmp_path, text):
+    path = tmp_path / "jobs.csv"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_reads_rows_and_skips_comments(tmp_path):
+    path = _manifest(tmp_path, "# op,input,output\n\nrotate,a.pdf,b.pdf,90\nsplit,b.pdf\n")
+    assert read_manifest(path) == [
+        (3, "rotate", "a.pdf", "b.pdf", "90"),
+        (4, "split", "b.pdf", "pages", None),
+    ]
+
+
+def test_unknown_operation(tmp_path):
+    path = _manifest(tmp_path, "shrink,a.pdf,b.pdf\n")
+    with pytest.raises(ValueError, match=r":1: unknown operation 'shrink'"):
+        read_manifest(path)
+
+
+def test_rotate_needs_whole_degrees(tmp_path):
+    path = _manifest(tmp_path, "rotate,a.pdf,b.pdf,abc\n")
+    with pytest.raises(ValueError, match=r":1: rotate needs whole degrees, got 'abc'"):
+        read_manifest(path)
+
+
+def test_split_needs_an_input(tmp_path):
+    path = _manifest(tmp_path, "split\n")
+    with pytest.raises(ValueError, match=r":1: expected split,input,output"):
+        read_manifest(path)
+
+
+def test_row_that_reads_another_rows_output_waits():
+    jobs = [(1, "convert", "a.txt", "a.pdf", None), (2, "compress", "a.pdf", "b.pdf", None)]
+    assert _manifest_stages(jobs) == [0, 1]
+
+
+def test_row_that_overwrites_an_earlier_input_waits():
+    jobs = [(1, "compress", "a.pdf", "b.pdf", None), (2, "convert", "a.txt", "a.pdf", None)]
+    assert _manifest_stages(jobs) == [0, 1]
+
+
+def test_splits_into_the_same_folder_run_apart():
+    jobs = [(1, "split", "a.pdf", "pages", None), (2, "split", "b.pdf", "pages", None),
+            (3, "split", "c.pdf", "other", None)]
+    assert _manifest_stages(jobs) == [0, 1, 0]
+
+
+def test_reading_a_split_page_waits_for_the_split():
+    jobs = [(1, "split", "a.pdf", "pages", None),
+            (2, "rotate", os.path.join("pages", "page_001.pdf"), "r.pdf", "90")]
+    assert _manifest_stages(jobs) == [0, 1]
+
+
+def test_reading_a_rendered_page_waits_for_the_render():
+    jobs = [(1, "convert", "a.pdf", "a.png", None),
+            (2, "convert", "a_001.png", "a_001.jpg", None),
+            (3, "convert", "a_x.png", "a_x.jpg", None)]
+    assert _manifest_stages(jobs) == [0, 1, 0]
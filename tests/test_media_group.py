@@ -0,0 +1,11 @@
+from convctl.ops import _media_group_cmd
+
+
+def test_each_output_takes_metadata_from_its_own_input():
+    group = [("a.wav", "a.mp3"), ("b.wav", "b.mp3"), ("c.wav", "c.mp3")]
+    cmd = _media_group_cmd("ffmpeg", group)
+    assert cmd[:8] == ["ffmpeg", "-y", "-i", "a.wav", "-i", "b.wav", "-i", "c.wav"]
+    for n, (_, out) in enumerate(group):
+        end = cmd.index(out)
+        assert cmd[end - 6:end] == ["-map", f"{n}:a:0", "-map_metadata", str(n),
+                                    "-map_chapters", str(n)]
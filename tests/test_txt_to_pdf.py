@@ -0,0 +1,64 @@
+import re
+
+import pytest
+
+from convctl.ops import TEXT_LINES_PER_PAGE, txt_to_pdf
+
+
+def _convert(tmp_path, text):
+    src = tmp_path / "in.txt"
+    src.write_text(text, encoding="utf-8")
+    out = tmp_path / "out.pdf"
+    txt_to_pdf(str(src), str(out))
+    return out.read_bytes()
+
+
+def _xref_offsets(data):
+    startxref = int(re.search(rb"startxref\n(\d+)\n%%EOF\n$", data).group(1))
+    assert data[startxref:].startswith(b"xref\n")
+    lines = data[startxref:].split(b"\n")
+    first, count = map(int, lines[1].split())
+    assert first == 0
+    entries = lines[2:2 + count]
+    assert entries[0] == b"0000000000 65535 f "
+    return {num: int(entry[:10]) for num, entry in enumerate(entries[1:], 1)}
+
+
+@pytest.mark.parametrize(
+    "n_lines", [0, 1, TEXT_LINES_PER_PAGE, TEXT_LINES_PER_PAGE + 1, 3 * TEXT_LINES_PER_PAGE + 7]
+)
+def test_xref_offsets_point_at_objects(tmp_path, n_lines):
+    data = _convert(tmp_path, "".join(f"line {i}\n" for i in range(n_lines)))
+    offsets = _xref_offsets(data)
+    assert offsets
+    for num, offset in offsets.items():
+        assert data[offset:].startswith(b"%d 0 obj\n" % num)
+
+
+@pytest.mark.parametrize("n_lines,pages", [
+    (1, 1),
+    (TEXT_LINES_PER_PAGE, 1),
+    (TEXT_LINES_PER_PAGE + 1, 2),
+    (3 * TEXT_LINES_PER_PAGE + 7, 4),
+])
+def test_page_count(tmp_path, n_lines, pages):
+    data = _convert(tmp_path, "".join(f"line {i}\n" for i in range(n_lines)))
+    assert int(re.search(rb"/Count (\d+)", data).group(1)) == pages
+    assert len(re.findall(rb"/Type /Page ", data)) == pages
+
+
+def test_empty_file_gives_one_page(tmp_path):
+    data = _convert(tmp_path, "")
+    assert int(re.search(rb"/Count (\d+)", data).group(1)) == 1
+
+
+def test_pypdf_reads_output(tmp_path):
+    pypdf = pytest.importorskip("pypdf")
+    src = tmp_path / "in.txt"
+    src.write_text("".join(f"line {i}\n" for i in range(TEXT_LINES_PER_PAGE + 1)), encoding="utf-8")
+    out = tmp_path / "out.pdf"
+    txt_to_pdf(str(src), str(out))
+    reader = pypdf.PdfReader(str(out), strict=True)
+    assert len(reader.pages) == 2
+    assert "line 0" in reader.pages[0].extract_text()
+    assert f"line {TEXT_LINES_PER_PAGE}" in reader.pages[1].extract_text()